@@ -1,3 +1,11 @@
 from .enums import Voice, ConverterStatus
-from .converter import VoiceConverter
-from .config import ConverterConfig
\ No newline at end of file
+from .converter import VoiceConverter, AsyncVoiceConverter
+from .config import ConverterConfig, PollingPolicy
+from .cache import SynthesisCache
+from .poller import StatusPoller
+from .metrics import MetricsHook, InMemoryMetrics
+from .limiter import RateLimiter
+from .journal import TaskJournal
+from .endpoint import EndpointPool
+from .breaker import CircuitBreaker
+from .audio import AudioPostProcessor
\ No newline at end of file
@@ -0,0 +1,230 @@
+"""
+批次轉換文字檔(.txt/.ssml/.xml)為語音檔
+
+python -m ai_voice_sdk "docs/**/*.txt" "ssml/*.ssml" --token TOKEN --voice NOETIC --output-dir wav --processes 4 --workers 2
+
+每個輸入檔輸出一個合併後的wav，輸出檔比輸入檔新時略過(--force強制重新轉換)
+指定--output-dir時，依輸入檔相對於glob開頭資料夾的路徑建立子資料夾，兩個輸入檔輸出到同一個檔案時不執行
+"""
+import os
+import sys
+import glob
+import time
+import wave
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import requests
+
+from .config import ConverterConfig, Settings
+from .converter import VoiceConverter
+from .audio import AudioPostProcessor
+from .enums import Voice, ConverterStatus
+
+
+_worker_config = None
+_worker_session = None
+_worker_options = None
+
+
+def _init_worker(token:str, server_url:str, voice_name:str, options:dict):
+    """
+    每個worker process建立自己的設定檔與連線池，同一個process轉換的檔案共用連線
+    """
+    global _worker_config, _worker_session, _worker_options
+    server_urls = [url.strip() for url in server_url.split(",") if url.strip()]
+    _worker_config = ConverterConfig(token, server_urls[0])
+    if len(server_urls) > 1:
+        _worker_config.set_servers(server_urls, options['routing'])
+    _worker_config.set_voice(Voice[voice_name])
+    _worker_options = options
+
+    _worker_session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=len(server_urls), pool_maxsize=max(Settings.pool_size, options['workers']))
+    _worker_session.mount("https://", adapter)
+    _worker_session.mount("http://", adapter)
+
+
+def _get_audio_seconds(file_path:str) -> float:
+    try:
+        with wave.open(file_path, 'rb') as reader:
+            return reader.getnframes() / reader.getframerate()
+    except Exception:
+        return 0.0
+
+
+def _convert_file(input_path:str, output_path:str) -> dict:
+    """
+    return：{"input", "output", "status", "chars", "tasks", "seconds", "audio_seconds", "error"}
+    """
+    report = {"input": input_path, "output": output_path, "status": "failed", "chars": 0, "tasks": 0,
+              "seconds": 0.0, "audio_seconds": 0.0, "error": ""}
+    start_time = time.perf_counter()
+    try:
+        converter = VoiceConverter(_worker_config, session=_worker_session)
+        converter.text.open_text_file(input_path)
+        report['chars'] = sum(paragraph._length for paragraph in converter._text)
+
+        result = converter.run(interval_time=_worker_options['interval'], is_wait_speech=True,
+                               max_workers=_worker_options['workers'])
+        report['tasks'] = len(converter._task_list)
+        if result.status != ConverterStatus.GetSpeechSuccess:
+            report['error'] = result.error_message
+            return report
+
+        # 先寫入暫存檔，轉換中斷時不會留下比輸入檔新的不完整輸出
+        temp_name = f"{output_path[:-len('.wav')]}.{os.getpid()}.part"
+        post_processor = AudioPostProcessor() if _worker_options['post_process'] else None
+        result.save(temp_name, is_merge=True, post_processor=post_processor)
+        os.replace(f"{temp_name}.wav", output_path)
+
+        report['status'] = "converted"
+        report['audio_seconds'] = _get_audio_seconds(output_path)
+    except Exception as error:
+        report['error'] = str(error)
+    finally:
+        report['seconds'] = time.perf_counter() - start_time
+    return report
+
+
+def _get_glob_root(pattern:str) -> str:
+    """
+    return：pattern中不含萬用字元的開頭資料夾，例如"docs/**/*.txt"為"docs"
+    """
+    parts = []
+    for part in os.path.dirname(pattern).split(os.sep):
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts)
+
+
+def _find_input_files(patterns:list) -> list:
+    """
+    return：[(input_path, glob_root)]
+    """
+    input_files = []
+    file_paths = set()
+    for pattern in patterns:
+        root = _get_glob_root(pattern)
+        for file_path in sorted(glob.glob(pattern, recursive=True)):
+            extension = os.path.splitext(file_path)[1].lower()
+            if os.path.isfile(file_path) and (extension in Settings.support_file_type) and (file_path not in file_paths):
+                file_paths.add(file_path)
+                input_files.append((file_path, root))
+    return input_files
+
+
+def _get_output_path(input_path:str, root:str, output_dir) -> str:
+    """
+    指定output_dir時，依輸入檔相對於glob root的路徑建立子資料夾，不同資料夾的同名檔案不會互相覆蓋
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    directory = os.path.dirname(input_path)
+    if output_dir != None:
+        directory = os.path.normpath(os.path.join(output_dir, os.path.relpath(directory, root or os.curdir)))
+    return os.path.join(directory, f"{stem}.wav")
+
+
+def _is_up_to_date(input_path:str, output_path:str) -> bool:
+    return os.path.exists(output_path) and (os.path.getmtime(output_path) >= os.path.getmtime(input_path))
+
+
+def _print_report(report:dict):
+    if report['status'] == "converted":
+        print(f"[OK]   {report['input']} -> {report['output']} ({report['tasks']} tasks, {report['chars']} chars, "
+              f"{report['audio_seconds']:.1f}s audio, {report['seconds']:.2f}s)", flush=True)
+    elif report['status'] == "skipped":
+        print(f"[SKIP] {report['input']} (up to date)", flush=True)
+    else:
+        print(f"[FAIL] {report['input']}: {report['error']}", flush=True)
+
+
+def _print_summary(reports:list, wall_time:float):
+    converted = [report for report in reports if report['status'] == "converted"]
+    skipped = len([report for report in reports if report['status'] == "skipped"])
+    failed = len(reports) - len(converted) - skipped
+    chars = sum(report['chars'] for report in converted)
+    tasks = sum(report['tasks'] for report in converted)
+    audio_seconds = sum(report['audio_seconds'] for report in converted)
+
+    print(f"\nFiles: {len(converted)} converted, {skipped} skipped, {failed} failed")
+    print(f"Tasks: {tasks}, chars: {chars}, audio: {audio_seconds:.1f}s")
+    if wall_time > 0:
+        print(f"Time: {wall_time:.2f}s, {len(converted) / wall_time:.2f} files/s, {chars / wall_time:.1f} chars/s, "
+              f"{audio_seconds / wall_time:.1f}x realtime")
+
+
+def main(argv = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ai_voice_sdk", description="Convert .txt/.ssml/.xml files to wav in batch.")
+    parser.add_argument("inputs", nargs="+", help="input files or glob patterns ('**' is recursive)")
+    parser.add_argument("--token", default=os.environ.get("AI_VOICE_TOKEN"), help="API token (default: $AI_VOICE_TOKEN)")
+    parser.add_argument("--server", default=os.environ.get("AI_VOICE_SERVER", "https://www.aivoice.com.tw"),
+                        help="server url, or comma separated urls of several servers (default: $AI_VOICE_SERVER or https://www.aivoice.com.tw)")
+    parser.add_argument("--routing", default="least_outstanding", choices=["least_outstanding", "latency"],
+                        help="how to pick a server for each task when several servers are given")
+    parser.add_argument("--voice", default="NOETIC", choices=[voice.name for voice in Voice])
+    parser.add_argument("--output-dir", default=None, help="output directory (default: next to each input file)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes converting files in parallel")
+    parser.add_argument("--workers", type=int, default=1, help="tasks of one file synthesized at the same time")
+    parser.add_argument("--interval", type=int, default=1, help="retry interval when the server is busy, 0-10 seconds")
+    parser.add_argument("--force", action="store_true", help="convert even if the output is up to date")
+    parser.add_argument("--post-process", action="store_true",
+                        help="trim silence, match loudness and crossfade between tasks (faster with numpy installed)")
+    args = parser.parse_args(argv)
+
+    if not args.token:
+        parser.error("--token is required (or set AI_VOICE_TOKEN)")
+    if (args.processes < 1) or (args.workers < 1):
+        parser.error("--processes and --workers must be at least 1")
+    if (args.interval < 0) or (args.interval > 10):
+        parser.error("--interval must be between 0 and 10")
+    if not args.server.replace(",", "").strip():
+        parser.error("--server is empty")
+
+    input_files = _find_input_files(args.inputs)
+    if len(input_files) == 0:
+        print("No input file found.")
+        return 1
+
+    output_paths = {}
+    for input_path, root in input_files:
+        output_path = _get_output_path(input_path, root, args.output_dir)
+        key = os.path.normcase(os.path.abspath(output_path))
+        if key in output_paths:
+            print(f"Output conflict: {output_paths[key]} and {input_path} both write {output_path}")
+            return 1
+        output_paths[key] = input_path
+
+    reports = []
+    jobs = []
+    for input_path, root in input_files:
+        output_path = _get_output_path(input_path, root, args.output_dir)
+        if (not args.force) and _is_up_to_date(input_path, output_path):
+            reports.append({"input": input_path, "output": output_path, "status": "skipped"})
+            _print_report(reports[-1])
+        else:
+            os.makedirs(os.path.dirname(output_path) or os.curdir, exist_ok=True)
+            jobs.append((input_path, output_path))
+
+    options = {"workers": args.workers, "interval": args.interval, "routing": args.routing, "post_process": args.post_process}
+    init_args = (args.token, args.server, args.voice, options)
+    start_time = time.perf_counter()
+    if args.processes == 1:
+        _init_worker(*init_args)
+        for input_path, output_path in jobs:
+            reports.append(_convert_file(input_path, output_path))
+            _print_report(reports[-1])
+    else:
+        with ProcessPoolExecutor(max_workers=args.processes, initializer=_init_worker, initargs=init_args) as executor:
+            futures = [executor.submit(_convert_file, input_path, output_path) for input_path, output_path in jobs]
+            for future in futures:
+                reports.append(future.result())
+                _print_report(reports[-1])
+
+    _print_summary(reports, time.perf_counter() - start_time)
+    return 0 if all(report['status'] != "failed" for report in reports) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
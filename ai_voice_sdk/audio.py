@@ -0,0 +1,324 @@
+import sys
+import math
+import struct
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+_WAV_HEADER_SIZE = 44
+_SCAN_BLOCK_SIZE = 4096 # 沒有numpy時，尋找靜音範圍每次以max/min檢查的sample數
+
+
+def _parse_wav(data) -> tuple:
+    """
+    解析wav的header，不複製音訊資料\n
+    return：((nchannels, sampwidth, framerate), PCM資料的memoryview)
+    """
+    view = memoryview(data)
+    if (len(view) < 12) or (view[0:4] != b"RIFF") or (view[8:12] != b"WAVE"):
+        raise ValueError("Audio data is not a wav file.")
+
+    params = None
+    offset = 12
+    while offset + 8 <= len(view):
+        chunk_id = view[offset:offset + 4].tobytes()
+        chunk_size = struct.unpack_from("<I", view, offset + 4)[0]
+        if chunk_id == b"fmt ":
+            audio_format, nchannels, framerate, _, _, bits = struct.unpack_from("<HHIIHH", view, offset + 8)
+            if audio_format != 1:
+                raise ValueError(f"Unsupported wav format: {audio_format}, only PCM is supported.")
+            params = (nchannels, bits // 8, framerate)
+        elif chunk_id == b"data":
+            if params == None:
+                raise ValueError("Wav 'fmt ' chunk is missing.")
+            pcm = view[offset + 8:min(offset + 8 + chunk_size, len(view))]
+            # 不完整的最後一個frame不使用
+            return (params, pcm[:len(pcm) - len(pcm) % (params[0] * params[1])])
+        # chunk大小為奇數時有一個padding byte
+        offset += 8 + chunk_size + (chunk_size & 1)
+
+    raise ValueError("Wav 'data' chunk is missing.")
+
+
+def _check_wav_params(wav_list:list) -> tuple:
+    """
+    wav_list：_parse_wav的結果，要合併的wav格式需相同\n
+    return：((nchannels, sampwidth, framerate), [PCM memoryview])
+    """
+    if len(wav_list) == 0:
+        raise ValueError("Audio data list is empty.")
+    params = wav_list[0][0]
+    for each_params, _ in wav_list:
+        if each_params != params:
+            raise ValueError(f"Can not merge wav file with different params: {params} and {each_params}")
+    return (params, [pcm for _, pcm in wav_list])
+
+
+def _parse_wav_list(audio_data_list:list) -> tuple:
+    """
+    return：((nchannels, sampwidth, framerate), [PCM memoryview])
+    """
+    return _check_wav_params([_parse_wav(audio_data) for audio_data in audio_data_list])
+
+
+def _create_wav_header(nchannels:int, sampwidth:int, framerate:int, nframes:int) -> bytes:
+    data_size = nframes * nchannels * sampwidth
+    return struct.pack("<4sI4s4sIHHIIHH4sI", b"RIFF", 36 + data_size, b"WAVE", b"fmt ", 16, 1, nchannels, framerate,
+                       framerate * nchannels * sampwidth, nchannels * sampwidth, sampwidth * 8, b"data", data_size)
+
+
+def _get_merged_header(params:tuple, pcm_list:list) -> bytes:
+    nchannels, sampwidth, framerate = params
+    return _create_wav_header(nchannels, sampwidth, framerate, sum(len(pcm) for pcm in pcm_list) // (nchannels * sampwidth))
+
+
+def _merge_wav(params:tuple, pcm_list:list) -> bytearray:
+    """
+    將多段PCM資料合併為wav，輸出buffer只配置一次，每段PCM資料只複製一次
+    """
+    header = _get_merged_header(params, pcm_list)
+    buffer = bytearray(len(header) + sum(len(pcm) for pcm in pcm_list))
+    buffer[:len(header)] = header
+    position = len(header)
+    for pcm in pcm_list:
+        buffer[position:position + len(pcm)] = pcm
+        position += len(pcm)
+    return buffer
+
+
+def _write_wav(stream, params:tuple, pcm_list:list) -> int:
+    """
+    依序將合併後的header與每段PCM資料寫入stream，不建立合併的buffer\n
+    return：寫入的bytes數
+    """
+    header = _get_merged_header(params, pcm_list)
+    stream.write(header)
+    for pcm in pcm_list:
+        stream.write(pcm)
+    return len(header) + sum(len(pcm) for pcm in pcm_list)
+
+
+class AudioPostProcessor(object):
+    """
+    合併音檔時的後製處理，只支援16-bit PCM的wav\n
+    trim_silence：是否移除每段音檔開頭與結尾的靜音\n
+    silence_threshold：音量低於此值(dBFS)視為靜音\n
+    keep_silence：移除靜音時，開頭與結尾各保留的長度(秒)\n
+    normalize：是否將每段音檔的音量(RMS)調整為一致\n
+    target_level：目標音量(RMS, dBFS)，None=所有段落音量的中位數\n
+    max_gain：調整音量的倍率上限(dB)，避免放大幾乎無聲的段落\n
+    crossfade：段落銜接處交叉淡化的長度(秒)，0=不淡化\n
+    有安裝numpy時以numpy向量運算處理，否則以memoryview逐一處理sample(純Python，比numpy慢約兩個數量級，需little-endian平台)\n
+    所有段落直接寫入預先配置的輸出buffer
+    """
+    trim_silence:bool
+    silence_threshold:float
+    keep_silence:float
+    normalize:bool
+    target_level:float
+    max_gain:float
+    crossfade:float
+
+    def __init__(self, trim_silence = True, silence_threshold = -50.0, keep_silence = 0.05, normalize = True, \
+                 target_level = None, max_gain = 12.0, crossfade = 0.01) -> None:
+        if (type(trim_silence) != bool) or (type(normalize) != bool):
+            raise TypeError("Parameter 'trim_silence(bool)' and 'normalize(bool)' type error.")
+        if silence_threshold >= 0:
+            raise ValueError("Parameter 'silence_threshold(float)' should be less than 0 dBFS.")
+        if keep_silence < 0:
+            raise ValueError("Parameter 'keep_silence(float)' value error.")
+        if (target_level != None) and (target_level >= 0):
+            raise ValueError("Parameter 'target_level(float)' should be less than 0 dBFS.")
+        if max_gain < 0:
+            raise ValueError("Parameter 'max_gain(float)' value error.")
+        if crossfade < 0:
+            raise ValueError("Parameter 'crossfade(float)' value error.")
+
+        self.trim_silence = trim_silence
+        self.silence_threshold = silence_threshold
+        self.keep_silence = keep_silence
+        self.normalize = normalize
+        self.target_level = target_level
+        self.max_gain = max_gain
+        self.crossfade = crossfade
+
+
+    def _get_trim_range(self, first_loud:int, last_loud:int, nframes:int, framerate:int) -> tuple:
+        """
+        first_loud, last_loud：第一個與最後一個超過silence_threshold的frame，整段都是靜音時為None\n
+        return：保留的frame範圍(start, end)
+        """
+        keep_frames = int(self.keep_silence * framerate)
+        if first_loud == None:
+            return (0, min(nframes, 2 * keep_frames))
+        return (max(0, first_loud - keep_frames), min(nframes, last_loud + 1 + keep_frames))
+
+
+    def _get_gains(self, rms_list:list) -> list:
+        if not self.normalize:
+            return [1.0] * len(rms_list)
+
+        voiced_rms = sorted(rms for rms in rms_list if rms > 0)
+        if len(voiced_rms) == 0:
+            return [1.0] * len(rms_list)
+
+        if self.target_level == None:
+            target_rms = voiced_rms[len(voiced_rms) // 2]
+        else:
+            target_rms = 32768 * 10 ** (self.target_level / 20)
+        max_gain = 10 ** (self.max_gain / 20)
+        return [1.0 if rms <= 0 else min(max_gain, max(1 / max_gain, target_rms / rms)) for rms in rms_list]
+
+
+    def _get_crossfades(self, lengths:list, framerate:int) -> list:
+        """
+        return：每段音檔與前一段重疊的frame數，第一段為0
+        """
+        crossfade_frames = int(self.crossfade * framerate)
+        crossfades = [0]
+        for index in range(1, len(lengths)):
+            crossfades.append(min(crossfade_frames, lengths[index - 1] // 2, lengths[index] // 2))
+        return crossfades
+
+
+    def _create_buffer(self, params:tuple, nframes:int) -> bytearray:
+        nchannels, sampwidth, framerate = params
+        buffer = bytearray(_WAV_HEADER_SIZE + nframes * nchannels * sampwidth)
+        buffer[:_WAV_HEADER_SIZE] = _create_wav_header(nchannels, sampwidth, framerate, nframes)
+        return buffer
+
+
+    def process(self, audio_data_list:list) -> bytearray:
+        """
+        audio_data_list：依順序排列的wav音檔資料(bytes)\n
+        return：處理並合併後的wav音檔
+        """
+        params, pcm_list = _parse_wav_list(audio_data_list)
+        if params[1] != 2:
+            raise ValueError(f"Audio post-processing only supports 16-bit PCM, got {params[1] * 8}-bit.")
+        if numpy != None:
+            return self._process_numpy(params, pcm_list)
+        return self._process_array(params, pcm_list)
+
+
+    def _process_numpy(self, params:tuple, pcm_list:list) -> bytearray:
+        nchannels, _, framerate = params
+        threshold = 32768 * 10 ** (self.silence_threshold / 20)
+
+        segments = []
+        for pcm in pcm_list:
+            frames = numpy.frombuffer(pcm, dtype="<i2").reshape(-1, nchannels)
+            if self.trim_silence and (len(frames) > 0):
+                is_loud = ((frames > threshold) | (frames < -threshold)).any(axis=1)
+                loud_index = numpy.flatnonzero(is_loud)
+                if len(loud_index) == 0:
+                    start, end = self._get_trim_range(None, None, len(frames), framerate)
+                else:
+                    start, end = self._get_trim_range(int(loud_index[0]), int(loud_index[-1]), len(frames), framerate)
+                frames = frames[start:end]
+            segments.append(frames)
+
+        # 所有段落共用同一個運算用的buffer
+        work = numpy.empty(max(len(frames) for frames in segments) * nchannels, dtype=numpy.float32)
+        rms_list = []
+        for frames in segments:
+            samples = work[:frames.size]
+            samples[:] = frames.ravel()
+            rms_list.append(math.sqrt(float(numpy.dot(samples, samples)) / frames.size) if frames.size > 0 else 0.0)
+
+        gains = self._get_gains(rms_list)
+        crossfades = self._get_crossfades([len(frames) for frames in segments], framerate)
+        nframes = sum(len(frames) for frames in segments) - sum(crossfades)
+        buffer = self._create_buffer(params, nframes)
+        output = numpy.frombuffer(buffer, dtype="<i2", offset=_WAV_HEADER_SIZE).reshape(-1, nchannels)
+
+        position = 0
+        for frames, gain, crossfade in zip(segments, gains, crossfades):
+            samples = work[:frames.size].reshape(-1, nchannels)
+            numpy.multiply(frames, gain, out=samples)
+            if crossfade > 0:
+                fade_in = (numpy.arange(1, crossfade + 1, dtype=numpy.float32) / (crossfade + 1)).reshape(-1, 1)
+                position -= crossfade
+                samples[:crossfade] *= fade_in
+                samples[:crossfade] += output[position:position + crossfade] * (1 - fade_in)
+            numpy.rint(samples, out=samples)
+            numpy.clip(samples, -32768, 32767, out=samples)
+            output[position:position + len(frames)] = samples
+            position += len(frames)
+        return buffer
+
+
+    def _find_loud_sample(self, samples:memoryview, threshold:float, is_reverse:bool):
+        """
+        以區塊的max/min(C實作)找出第一個(is_reverse = True時為最後一個)超過threshold的sample，只在該區塊內逐一檢查\n
+        return：sample的位置，整段都是靜音時為None
+        """
+        block_starts = range(0, len(samples), _SCAN_BLOCK_SIZE)
+        for block_start in (reversed(block_starts) if is_reverse else block_starts):
+            block = samples[block_start:block_start + _SCAN_BLOCK_SIZE]
+            if (max(block) > threshold) or (min(block) < -threshold):
+                indexes = range(len(block) - 1, -1, -1) if is_reverse else range(len(block))
+                return block_start + next(index for index in indexes if abs(block[index]) > threshold)
+        return None
+
+
+    def _process_array(self, params:tuple, pcm_list:list) -> bytearray:
+        """
+        沒有numpy時的處理方式，調整音量與交叉淡化需逐一計算每個sample(O(n)的Python迴圈)，比numpy慢約兩個數量級\n
+        不需調整音量的段落直接複製到輸出buffer
+        """
+        if sys.byteorder != "little":
+            raise RuntimeError("Audio post-processing without numpy requires a little-endian platform.")
+
+        nchannels, _, framerate = params
+        threshold = 32768 * 10 ** (self.silence_threshold / 20)
+
+        segments = []
+        for pcm in pcm_list:
+            samples = pcm.cast("h")
+            nframes = len(samples) // nchannels
+            if self.trim_silence and (nframes > 0):
+                first_loud = self._find_loud_sample(samples, threshold, False)
+                last_loud = None
+                if first_loud != None:
+                    first_loud //= nchannels
+                    last_loud = self._find_loud_sample(samples, threshold, True) // nchannels
+                start, end = self._get_trim_range(first_loud, last_loud, nframes, framerate)
+                samples = samples[start * nchannels:end * nchannels]
+            segments.append(samples)
+
+        rms_list = [math.sqrt(sum(map(operator.mul, samples, samples)) / len(samples)) if len(samples) > 0 else 0.0 \
+                    for samples in segments]
+        gains = self._get_gains(rms_list)
+        crossfades = self._get_crossfades([len(samples) // nchannels for samples in segments], framerate)
+        nframes = sum(len(samples) for samples in segments) // nchannels - sum(crossfades)
+        buffer = self._create_buffer(params, nframes)
+        output = memoryview(buffer)[_WAV_HEADER_SIZE:].cast("h")
+
+        position = 0
+        for samples, gain, crossfade in zip(segments, gains, crossfades):
+            # 重疊部分與前一段的結尾混合，直接寫回輸出buffer
+            overlap = crossfade * nchannels
+            position -= overlap
+            for index in range(overlap):
+                fade_in = (index // nchannels + 1) / (crossfade + 1)
+                mixed = samples[index] * gain * fade_in + output[position + index] * (1 - fade_in)
+                output[position + index] = min(32767, max(-32768, round(mixed)))
+
+            start = position + overlap
+            end = position + len(samples)
+            if gain == 1.0:
+                output[start:end] = samples[overlap:]
+            elif (len(samples) == 0) or (max(max(samples), -min(samples)) * gain < 32767):
+                # 放大後不會超出範圍時不需逐一限制數值
+                for index, value in zip(range(start, end), samples[overlap:]):
+                    output[index] = round(value * gain)
+            else:
+                for index, value in zip(range(start, end), samples[overlap:]):
+                    output[index] = min(32767, max(-32768, round(value * gain)))
+            position = end
+        return buffer
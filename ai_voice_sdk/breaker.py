@@ -0,0 +1,124 @@
+import time
+import asyncio
+import threading
+
+
+class CircuitBreaker(object):
+    """
+    client端的斷路器，伺服器持續忙碌或故障時不再送出註定失敗的request\n
+    每個伺服器的submit、status、download分開計算，連續failure_threshold次失敗(伺服器忙碌、5xx、連線錯誤或逾時)後開啟斷路器\n
+    開啟後recovery_time秒內不送出request，之後進入half-open，一次只允許一個request試探，成功即恢復，失敗則重新開啟\n
+    failure_threshold：開啟斷路器的連續失敗次數\n
+    recovery_time：斷路器開啟後，到允許試探request的時間(秒)\n
+    is_wait：斷路器開啟時，True = 在本機排隊等待試探成功後再送出，False = 立即回傳錯誤碼50399(預設)
+    """
+    _failure_threshold:int
+    _recovery_time:float
+    _is_wait:bool
+    _circuits:dict # {(server_url, operation): {"state", "failures", "retry_time", "probe_time"}}
+
+    _wait_interval = 0.05 # 等待試探request結果時，重新檢查的間隔(秒)
+
+    def __init__(self, failure_threshold = 5, recovery_time = 10.0, is_wait = False) -> None:
+        if type(failure_threshold) != int:
+            raise TypeError("Parameter 'failure_threshold(int)' type error.")
+        if failure_threshold < 1:
+            raise ValueError("Parameter 'failure_threshold(int)' value error.")
+        if (type(recovery_time) not in [int, float]) or (recovery_time <= 0):
+            raise ValueError("Parameter 'recovery_time(float)' value error.")
+        if type(is_wait) != bool:
+            raise TypeError("Parameter 'is_wait(bool)' type error.")
+
+        self._failure_threshold = failure_threshold
+        self._recovery_time = recovery_time
+        self._is_wait = is_wait
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+
+    def is_wait(self) -> bool:
+        return self._is_wait
+
+
+    def _get_circuit(self, server_url:str, operation:str) -> dict:
+        # 呼叫前需持有self._lock
+        key = (server_url, operation)
+        if key not in self._circuits:
+            self._circuits[key] = {"state": "closed", "failures": 0, "retry_time": 0.0, "probe_time": None}
+        return self._circuits[key]
+
+
+    def _try_acquire(self, server_url:str, operation:str) -> float:
+        """
+        return：0 = 可以送出request，否則為需要等待的時間
+        """
+        with self._lock:
+            circuit = self._get_circuit(server_url, operation)
+            if circuit['state'] == "closed":
+                return 0
+
+            now = time.monotonic()
+            if now < circuit['retry_time']:
+                return circuit['retry_time'] - now
+
+            # half-open：試探request沒有回報結果(例如被取消)時，recovery_time後允許下一個試探
+            if (circuit['probe_time'] == None) or (now - circuit['probe_time'] >= self._recovery_time):
+                circuit['state'] = "half_open"
+                circuit['probe_time'] = now
+                return 0
+            return self._wait_interval
+
+
+    def allow(self, server_url:str, operation:str) -> bool:
+        """
+        operation：["submit", "status", "download"]\n
+        return：是否可以送出request，不等待
+        """
+        return self._try_acquire(server_url, operation) == 0
+
+
+    def wait(self, server_url:str, operation:str):
+        """
+        等待直到可以送出request
+        """
+        wait_time = self._try_acquire(server_url, operation)
+        while wait_time > 0:
+            time.sleep(wait_time)
+            wait_time = self._try_acquire(server_url, operation)
+
+
+    async def wait_async(self, server_url:str, operation:str):
+        """
+        非阻塞版本的wait
+        """
+        wait_time = self._try_acquire(server_url, operation)
+        while wait_time > 0:
+            await asyncio.sleep(wait_time)
+            wait_time = self._try_acquire(server_url, operation)
+
+
+    def on_success(self, server_url:str, operation:str):
+        with self._lock:
+            circuit = self._get_circuit(server_url, operation)
+            circuit['state'] = "closed"
+            circuit['failures'] = 0
+            circuit['probe_time'] = None
+
+
+    def on_failure(self, server_url:str, operation:str):
+        with self._lock:
+            circuit = self._get_circuit(server_url, operation)
+            circuit['failures'] += 1
+            if (circuit['state'] == "half_open") or (circuit['failures'] >= self._failure_threshold):
+                circuit['state'] = "open"
+                circuit['retry_time'] = time.monotonic() + self._recovery_time
+                circuit['probe_time'] = None
+
+
+    def get_state(self, server_url:str, operation:str) -> str:
+        """
+        return：["closed", "open", "half_open"]
+        """
+        with self._lock:
+            circuit = self._circuits.get((server_url, operation))
+            return "closed" if circuit == None else circuit['state']
@@ -0,0 +1,165 @@
+import os
+import json
+import threading
+from collections import OrderedDict
+
+from .config import ConverterConfig
+
+class SynthesisCache(object):
+    """
+    本機語音合成快取，以(聲音, SSML版本, SSML語言, 任務SSML內容)為key，將合成結果(wav)存在硬碟\n
+    cache_dir：快取資料夾\n
+    max_size：快取大小上限(bytes)，超過時優先刪除最久未使用的音檔\n
+    同一個快取可以同時給多個VoiceConverter(包含不同執行緒)使用
+    """
+    hits:int
+    misses:int
+
+    _cache_dir:str
+    _max_size:int
+    _index:OrderedDict # {key: size}，越後面越近期使用
+    _total_size:int
+
+    _index_file_name = "index.json"
+
+    def __init__(self, cache_dir:str, max_size = 512 * 1024 * 1024) -> None:
+        if type(cache_dir) != str:
+            raise TypeError("Parameter 'cache_dir(str)' type error.")
+        if type(max_size) != int:
+            raise TypeError("Parameter 'max_size(int)' type error.")
+        if max_size < 1:
+            raise ValueError("Parameter 'max_size(int)' value error.")
+
+        self.hits = 0
+        self.misses = 0
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+
+    def _get_path(self, key:str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.wav")
+
+
+    def _load_index(self):
+        self._index = OrderedDict()
+        index_path = os.path.join(self._cache_dir, self._index_file_name)
+        if os.path.exists(index_path):
+            try:
+                with open(index_path, 'r', encoding="utf-8") as f:
+                    self._index = OrderedDict(json.load(f))
+            except Exception:
+                # 索引檔損毀時，重新建立空的索引
+                self._index = OrderedDict()
+
+        # 移除音檔已不存在的項目
+        for key in [key for key in self._index if not os.path.exists(self._get_path(key))]:
+            del self._index[key]
+        self._total_size = sum(self._index.values())
+
+
+    def _save_index(self):
+        index_path = os.path.join(self._cache_dir, self._index_file_name)
+        temp_path = f"{index_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding="utf-8") as f:
+            json.dump(list(self._index.items()), f)
+        os.replace(temp_path, index_path)
+
+
+    def _evict(self):
+        while (self._total_size > self._max_size) and (len(self._index) > 0):
+            key, size = self._index.popitem(last=False)
+            self._total_size -= size
+            try:
+                os.remove(self._get_path(key))
+            except FileNotFoundError:
+                pass
+
+
+    def get_key(self, config:ConverterConfig, ssml_text:str) -> str:
+        """
+        config：轉換器設定檔\n
+        ssml_text：任務的SSML內容
+        """
+        return config.get_synthesis_key(ssml_text)
+
+
+    def get(self, key:str) -> bytes:
+        """
+        return：快取的wav音檔，沒有快取時回傳None
+        """
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+
+            try:
+                with open(self._get_path(key), 'rb') as f:
+                    data = f.read()
+            except FileNotFoundError:
+                self._total_size -= self._index.pop(key)
+                self.misses += 1
+                return None
+
+            self._index.move_to_end(key)
+            self.hits += 1
+            return data
+
+
+    def put(self, key:str, data:bytes):
+        """
+        key：由get_key產生的key\n
+        data：wav音檔
+        """
+        with self._lock:
+            if key in self._index:
+                self._index.move_to_end(key)
+                return
+
+            if len(data) > self._max_size:
+                return
+
+            path = self._get_path(key)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+            self._index[key] = len(data)
+            self._total_size += len(data)
+            self._evict()
+            self._save_index()
+
+
+    def flush(self):
+        """
+        將最近使用順序寫回索引檔
+        """
+        with self._lock:
+            self._save_index()
+
+
+    def clear(self):
+        """
+        清除所有快取
+        """
+        with self._lock:
+            for key in self._index:
+                try:
+                    os.remove(self._get_path(key))
+                except FileNotFoundError:
+                    pass
+            self._index.clear()
+            self._total_size = 0
+            self._save_index()
+
+
+    def get_stats(self) -> dict:
+        """
+        return：{"hits": 命中次數, "misses": 未命中次數, "count": 快取音檔數量, "size": 快取大小(bytes)}
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "count": len(self._index), "size": self._total_size}
@@ -1,4 +1,10 @@
+import time
+import random
+import hashlib
+
 from .enums import Voice
+from .metrics import MetricsHook
+from .endpoint import EndpointPool
 
 class Settings(object):
     text_limit = 1500
@@ -6,18 +12,107 @@ class Settings(object):
     support_file_type = [".txt", ".ssml", ".xml"]
     each_task_text_limit = text_limit + elastic_value
     print_log = False
+    read_block_size = 65536 # 逐段讀取/解析文字時，每段的字數
+    pool_size = 10
+    # (connect timeout, read timeout)，單位秒
+    timeout = {"submit": (5, 10), "status": (5, 10), "download": (5, 30)}
+    # 效能數據hook，預設不量測，可設為InMemoryMetrics或自訂的MetricsHook
+    metrics_hook = MetricsHook()
+
+class PollingPolicy(object):
+    """
+    查詢任務狀態與伺服器忙碌重試的等待策略(exponential backoff + jitter)\n
+    initial_delay：第一次等待時間(秒)\n
+    multiplier：每次等待後，下一次等待時間的倍率\n
+    max_delay：等待時間上限(秒)\n
+    jitter：等待時間的隨機抖動比例(0 <= jitter < 1)，避免多個client同時送出request\n
+    deadline：等待單一任務的總時間上限(秒)，None=不限制\n
+    seconds_per_char：依任務文字長度估計第一次查詢的時間(秒/字)，None=不估計
+    """
+    initial_delay:float
+    multiplier:float
+    max_delay:float
+    jitter:float
+    deadline:float
+    seconds_per_char:float
+
+    def __init__(self, initial_delay = 0.5, multiplier = 1.5, max_delay = 5.0, jitter = 0.1, \
+                 deadline = None, seconds_per_char = None) -> None:
+        for name, value in [("initial_delay", initial_delay), ("multiplier", multiplier), ("max_delay", max_delay), ("jitter", jitter)]:
+            if type(value) not in [int, float]:
+                raise TypeError(f"Parameter '{name}(float)' type error.")
+        for name, value in [("deadline", deadline), ("seconds_per_char", seconds_per_char)]:
+            if (value != None) and (type(value) not in [int, float]):
+                raise TypeError(f"Parameter '{name}(float)' type error.")
+
+        if initial_delay <= 0:
+            raise ValueError("Parameter 'initial_delay(float)' should be greater than 0.")
+        if multiplier < 1:
+            raise ValueError("Parameter 'multiplier(float)' should not be less than 1.")
+        if max_delay < initial_delay:
+            raise ValueError("Parameter 'max_delay(float)' should not be less than 'initial_delay'.")
+        if (jitter < 0) or (jitter >= 1):
+            raise ValueError("Parameter 'jitter(float)' should be in range [0, 1).")
+        if (deadline != None) and (deadline <= 0):
+            raise ValueError("Parameter 'deadline(float)' should be greater than 0.")
+        if (seconds_per_char != None) and (seconds_per_char < 0):
+            raise ValueError("Parameter 'seconds_per_char(float)' value error.")
+
+        self.initial_delay = initial_delay
+        self.multiplier = multiplier
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.deadline = deadline
+        self.seconds_per_char = seconds_per_char
+
+
+    def delays(self, text_length = 0, initial_delay = None, max_delay = None):
+        """
+        依序產生每次的等待時間，超過deadline後停止\n
+        text_length：任務文字長度，用於估計第一次查詢的時間\n
+        initial_delay, max_delay：覆寫策略的預設值(例如伺服器忙碌時的重試間隔)
+        """
+        if initial_delay == None:
+            initial_delay = self.initial_delay
+            if self.seconds_per_char != None:
+                initial_delay = max(initial_delay, text_length * self.seconds_per_char)
+        if max_delay == None:
+            max_delay = self.max_delay
+
+        start_time = time.monotonic()
+        delay = initial_delay
+        while True:
+            wait_time = delay * (1 + random.uniform(-self.jitter, self.jitter))
+            if self.deadline != None:
+                remaining_time = self.deadline - (time.monotonic() - start_time)
+                if remaining_time <= 0:
+                    return
+                wait_time = min(wait_time, remaining_time)
+
+            yield wait_time
+            delay = min(delay * self.multiplier, max_delay)
+
 
 class ConverterConfig(object):
     _token:str
     _server_url:str
+    _endpoint_pool:EndpointPool
 
     voice = None # 聲音預設值為None
     _ssml_version = "1.0.demo"
     _ssml_lang = "zh-TW"
 
+    _pool_size:int
+    _is_keep_alive:bool
+    _timeout:dict
+
     def __init__(self, token = "", server_url = "https://www.aivoice.com.tw") -> None:
+        self._endpoint_pool = None
         self.set_token(token)
         self.set_server(server_url)
+        self._pool_size = Settings.pool_size
+        self._is_keep_alive = True
+        self._timeout = dict(Settings.timeout)
 
 
     def set_token(self, token = "") -> None:
@@ -37,14 +132,46 @@ class ConverterConfig(object):
 
         if server_url.find("http") == 0:
             self._server_url = server_url
+            self._endpoint_pool = None
         else:
             raise ValueError("Please check url, it should be with 'http' or 'https'.")
 
 
     def get_server(self) -> str:
+        """
+        return：伺服器網址，使用多個endpoint時為預設endpoint
+        """
         return self._server_url
 
 
+    def set_servers(self, server_urls:list, routing = "least_outstanding") -> None:
+        """
+        server_urls：多個合成伺服器的網址，送出任務時依routing選擇，查詢狀態與下載音檔送到送出該任務的伺服器\n
+        routing：["least_outstanding", "latency"]，詳見EndpointPool
+        """
+        self.set_endpoint_pool(EndpointPool(server_urls, routing))
+
+
+    def set_endpoint_pool(self, endpoint_pool:EndpointPool) -> None:
+        """
+        endpoint_pool：多個設定檔可共用同一個pool，None=只使用get_server()的伺服器
+        """
+        if (endpoint_pool != None) and (type(endpoint_pool) != EndpointPool):
+            raise TypeError("Parameter 'endpoint_pool(EndpointPool)' type error.")
+
+        if endpoint_pool != None:
+            self._server_url = endpoint_pool.get_servers()[0]
+        self._endpoint_pool = endpoint_pool
+
+
+    def get_endpoint_pool(self) -> EndpointPool:
+        return self._endpoint_pool
+
+
+    def get_servers(self) -> list:
+        return [self._server_url] if self._endpoint_pool == None else self._endpoint_pool.get_servers()
+
+
     def set_voice(self, voice:Voice) -> None:
         if type(voice) != Voice:
             raise TypeError("Parameter 'voice(Voice)' type error.")
@@ -62,3 +189,57 @@ class ConverterConfig(object):
 
     def get_ssml_lang(self) -> str:
         return self._ssml_lang
+
+
+    def get_synthesis_key(self, ssml_text:str) -> str:
+        """
+        ssml_text：任務的SSML內容\n
+        return：(聲音, SSML版本, SSML語言, SSML內容)的hash，SynthesisCache與TaskJournal以此辨識相同的合成內容
+        """
+        voice = "" if self.voice == None else self.voice.value
+        source = "\0".join([voice, self._ssml_version, self._ssml_lang, ssml_text])
+        return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+
+    def set_connection_pool(self, pool_size = Settings.pool_size, is_keep_alive = True) -> None:
+        """
+        pool_size：連線池的最大連線數，同時執行的任務數量(max_workers)不應超過此值\n
+        is_keep_alive：是否重複使用連線
+        """
+        if type(pool_size) != int:
+            raise TypeError("Parameter 'pool_size(int)' type error.")
+        if pool_size < 1:
+            raise ValueError("Parameter 'pool_size(int)' value error.")
+        if type(is_keep_alive) != bool:
+            raise TypeError("Parameter 'is_keep_alive(bool)' type error.")
+
+        self._pool_size = pool_size
+        self._is_keep_alive = is_keep_alive
+
+
+    def get_pool_size(self) -> int:
+        return self._pool_size
+
+
+    def is_keep_alive(self) -> bool:
+        return self._is_keep_alive
+
+
+    def set_timeout(self, operation:str, connect_timeout:float, read_timeout:float) -> None:
+        """
+        operation：["submit", "status", "download"]，分別為送出任務、查詢狀態、下載音檔\n
+        connect_timeout：建立連線的逾時時間(秒)\n
+        read_timeout：等待伺服器回應的逾時時間(秒)
+        """
+        if operation not in self._timeout:
+            raise ValueError(f"Parameter 'operation(str)' should be one of {list(self._timeout.keys())}.")
+        if (type(connect_timeout) not in (int, float)) or (type(read_timeout) not in (int, float)):
+            raise TypeError("Parameter 'connect_timeout(float)' and 'read_timeout(float)' type error.")
+        if (connect_timeout <= 0) or (read_timeout <= 0):
+            raise ValueError("Parameter 'connect_timeout(float)' and 'read_timeout(float)' value error.")
+
+        self._timeout[operation] = (connect_timeout, read_timeout)
+
+
+    def get_timeout(self, operation:str) -> tuple:
+        return self._timeout[operation]
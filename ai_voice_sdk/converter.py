@@ -1,11 +1,20 @@
 import json
 import time
 import copy
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
 from .enums import ConverterStatus, Voice
-from .config import ConverterConfig, Settings
+from .config import ConverterConfig, PollingPolicy, Settings
 from .textedit import TextEditor
-from .units import RestfulApiHandler, Tools
+from .units import RestfulApiHandler, AsyncRestfulApiHandler, Tools
+from .cache import SynthesisCache
+from .journal import TaskJournal
+from .poller import StatusPoller
+from .limiter import RateLimiter
+from .breaker import CircuitBreaker
+from .audio import AudioPostProcessor, _parse_wav, _check_wav_params, _merge_wav, _write_wav
 
 status_and_error_codes = {
     20001: '成功',
@@ -29,6 +38,9 @@ status_and_error_codes = {
     404: '找不到資源, url 錯誤。',
     40199: 'Do not support self-signed certificate server.',
     40499: 'Unknown error. Can not get Restful API response, maybe "server url" is wrong.',
+    40899: 'Polling deadline exceeded, task is still running.',
+    42299: 'Downloaded audio size or checksum mismatch.',
+    50399: 'Circuit breaker is open, server is busy or unavailable.',
 }
 
 
@@ -40,28 +52,107 @@ class ConverterResult(object):
     error_msg：error message
     """
     status:ConverterStatus
-    task_data = [] # [{"id": (int)task_id, "data": (byte)auido_data}]
+    task_data:list # [{"id": (int)task_id, "data": (byte)auido_data}]
     detail:str
     error_message:str
+    _wav_cache:dict # {id(audio_data): (audio_data, (params, pcm))}
 
     def __init__(self, status:ConverterStatus, data, detail, error_msg) -> None:
         self.status = status
         self.task_data = data
         self.detail = detail
         self.error_message = error_msg
+        self._wav_cache = {}
 
-    def save(self, filename = "aivoice", is_merge = False) -> None:
+    def _get_audio_list(self) -> list:
+        audio_data = [each_data['data'] for each_data in self.task_data]
+        if (len(audio_data) == 0) or (None in audio_data):
+            raise ValueError("Task audio data is empty, please get speech first.")
+        return audio_data
+
+    def _get_wav(self, audio_data) -> tuple:
+        """
+        return：((nchannels, sampwidth, framerate), PCM memoryview)，同一個音檔的header只解析一次
+        """
+        cache = self._wav_cache.get(id(audio_data))
+        if (cache == None) or (cache[0] is not audio_data):
+            cache = (audio_data, _parse_wav(audio_data))
+            self._wav_cache[id(audio_data)] = cache
+        return cache[1]
+
+    def get_audio_params(self) -> tuple:
+        """
+        return：(nchannels, sampwidth, framerate)
+        """
+        return _check_wav_params([self._get_wav(audio_data) for audio_data in self._get_audio_list()])[0]
+
+    def get_pcm(self, index = 0) -> memoryview:
         """
-        filename：檔案名稱，預設為'aivoice'\n
+        index：第幾個音檔\n
+        return：音檔的PCM資料，直接參照下載的音檔，不複製
+        """
+        if type(index) != int:
+            raise TypeError("Parameter 'index(int)' type error.")
+        return self._get_wav(self._get_audio_list()[index])[1]
+
+    def to_buffer(self, post_processor = None) -> memoryview:
+        """
+        post_processor：合併時的後製處理(AudioPostProcessor)\n
+        return：合併後的wav音檔，只有一個音檔時直接參照該音檔，否則一次配置輸出buffer後依序填入每段PCM資料
+        """
+        if (post_processor != None) and (type(post_processor) != AudioPostProcessor):
+            raise TypeError("Parameter 'post_processor(AudioPostProcessor)' type error.")
+
+        audio_data = self._get_audio_list()
+        if post_processor != None:
+            return memoryview(post_processor.process(audio_data))
+        if len(audio_data) == 1:
+            return memoryview(audio_data[0])
+        params, pcm_list = _check_wav_params([self._get_wav(each_data) for each_data in audio_data])
+        return memoryview(_merge_wav(params, pcm_list))
+
+    def write_to(self, stream, post_processor = None) -> int:
+        """
+        stream：可寫入的binary stream\n
+        post_processor：合併時的後製處理(AudioPostProcessor)\n
+        將合併後的wav音檔寫入stream，依序寫入header與每段PCM資料，不建立合併的buffer\n
+        return：寫入的bytes數
+        """
+        if not hasattr(stream, "write"):
+            raise TypeError("Parameter 'stream' should be a writable binary stream.")
+        if (post_processor != None) and (type(post_processor) != AudioPostProcessor):
+            raise TypeError("Parameter 'post_processor(AudioPostProcessor)' type error.")
+
+        audio_data = self._get_audio_list()
+        if (post_processor != None) or (len(audio_data) == 1):
+            buffer = self.to_buffer(post_processor)
+            stream.write(buffer)
+            return len(buffer)
+        params, pcm_list = _check_wav_params([self._get_wav(each_data) for each_data in audio_data])
+        return _write_wav(stream, params, pcm_list)
+
+    def save(self, filename = "aivoice", is_merge = False, post_processor = None) -> None:
+        """
+        filename：檔案名稱，預設為'aivoice'，合併或只有一個音檔時也可傳入可寫入的binary stream\n
         is_merge：如果音檔數量超過一個，是否將其合併為一個檔案\n
+        post_processor：合併時的後製處理(AudioPostProcessor)，移除段落間的靜音、調整音量並交叉淡化，需合併或只有一個音檔\n
         """
         task_list_length = len(self.task_data)
+        if hasattr(filename, "write") and (task_list_length > 1) and (not is_merge):
+            raise TypeError("Parameter 'filename(str)' should be str when saving more than one file.")
+        if (post_processor != None) and (type(post_processor) != AudioPostProcessor):
+            raise TypeError("Parameter 'post_processor(AudioPostProcessor)' type error.")
+        if (post_processor != None) and (task_list_length > 1) and (not is_merge):
+            raise ValueError("Parameter 'post_processor' requires 'is_merge' when saving more than one file.")
+
         if task_list_length > 0:
-            if is_merge and (task_list_length > 1):
-                audio_data = []
-                for each_data in self.task_data:
-                    audio_data.append(each_data['data'])
-                Tools().merge_wav_file(filename, audio_data)
+            if (post_processor != None) or (is_merge and (task_list_length > 1)):
+                # 使用已解析的header，合併的header與每段PCM資料直接寫入檔案
+                if hasattr(filename, "write"):
+                    self.write_to(filename, post_processor)
+                else:
+                    with open(f"{filename}.wav", 'wb') as write_index:
+                        self.write_to(write_index, post_processor)
             else:
                 count = 1
                 for each_data in self.task_data:
@@ -75,21 +166,75 @@ class ConverterResult(object):
 
 
 class VoiceConverter(object):
+    """
+    語音轉換器\n
+    執行緒安全：每個VoiceConverter實例各自擁有文章、任務清單與設定檔，不同實例可以在不同執行緒同時執行；
+    同一個實例(包含其TextEditor)不可同時被多個執行緒呼叫。
+    SynthesisCache、StatusPoller與共用的requests.Session可安全地由多個實例共用。
+    """
     config:ConverterConfig
     text:TextEditor
+    polling_policy:PollingPolicy
     _api_handler:RestfulApiHandler
+    _cache:SynthesisCache
+    _journal:TaskJournal
+    _poller:StatusPoller
 
-    _text = []
+    _text:list
 
-    _task_list = [] # [{"id": "0~XX", "text": "paragraphs"}]
+    _task_list:list # [{"id": "0~XX", "text": "paragraphs"}]
     _each_task_text_limit = Settings.each_task_text_limit
 
-    def __init__(self, config = ConverterConfig()):
+    def __init__(self, config = ConverterConfig(), session = None, cache = None, poller = None, limiter = None, journal = None, circuit_breaker = None):
+        """
+        config：轉換器設定檔\n
+        session：共用的requests.Session，未指定時會依config的連線池設定自行建立\n
+        cache：語音合成快取(SynthesisCache)，命中快取的任務不會送出request\n
+        journal：任務進度紀錄(TaskJournal)，中斷後重新執行時接回伺服器上的任務，已下載的音檔不會重新下載\n
+        poller：共用的任務狀態查詢服務(StatusPoller)，指定時等待任務改由poller統一查詢\n
+        limiter：request速率限制(RateLimiter)，多個轉換器(或process)共用時一起計算\n
+        circuit_breaker：斷路器(CircuitBreaker)，伺服器持續忙碌或故障時立即回傳錯誤(或在本機排隊)，多個轉換器共用時一起計算
+        """
         self.config = copy.deepcopy(config)
-        self._api_handler = RestfulApiHandler(self.config)
+        self._text = []
+        self._task_list = []
+        self.polling_policy = PollingPolicy()
+        self._cache = None
+        self._journal = None
+        self._poller = None
+        if cache != None:
+            self.set_cache(cache)
+        if journal != None:
+            self.set_journal(journal)
+        if poller != None:
+            self.set_poller(poller)
+        self._api_handler = self._create_api_handler(session)
+        if limiter != None:
+            self.set_limiter(limiter)
+        if circuit_breaker != None:
+            self.set_circuit_breaker(circuit_breaker)
         self.text = TextEditor(self._text, self.__update_config_value)
 
 
+    def _create_api_handler(self, session) -> RestfulApiHandler:
+        return RestfulApiHandler(self.config, session)
+
+
+    def close(self):
+        """
+        關閉轉換器的連線池
+        """
+        self._api_handler.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
     def _translate_result_code(self, result_json:json) -> str:
         code = result_json['code']
         if code in status_and_error_codes:
@@ -102,33 +247,38 @@ class VoiceConverter(object):
             return result_json['data']
 
 
-    def __create_task_list(self):
-        # task_list = [{"id": "123", "text": "msg"}, {"id": "456", "text": "msgg"}, {"id": "789", "text": "msggg"}]
-        self._task_list.clear()
-
+    def _iter_tasks(self, paragraphs, first_task_limit = None):
+        """
+        paragraphs：依序排列的TextParagraph\n
+        first_task_limit：第一個任務的長度限制，未指定時與其他任務相同\n
+        依序將段落合併成不超過任務長度限制的任務，每產生一個任務即加入task_list並回傳
+        """
+        task_limit = self._each_task_text_limit if first_task_limit == None else first_task_limit
+        task = None
         length = 0
-        count = 0
-        i = 0
-        self._task_list.append({"id": "", "text": ""})
-        for i in range(len(self._text)-1):
-            length += self._text[i]._length
-            self._task_list[count]["text"] += (self._text[i]._text)
-            if length + self._text[i+1]._length > self._each_task_text_limit:
-                # print(f"over limit in {i} | {self._text[i]._text} | {length}")
-                self._task_list.append({"id": "", "text": ""})
-                count += 1
+        for paragraph in paragraphs:
+            if (task != None) and (length + paragraph._length > task_limit):
+                self._task_list.append(task)
+                yield task
+                task = None
+                task_limit = self._each_task_text_limit
+
+            if task == None:
+                task = {"id": "", "text": ""}
                 length = 0
+            task["text"] += paragraph._text
+            length += paragraph._length
+
+        if task != None:
+            self._task_list.append(task)
+            yield task
 
-        if len(self._text) > 1:
-            i += 1
-        if length + self._text[i]._length > self._each_task_text_limit:
-            self._task_list.append({"id": "", "text": self._text[i]._text})
-        else:
-            self._task_list[count]["text"] += self._text[i]._text
 
-        # print(f"{i} {len(self._task_list)}\n")
-        # for l in self._task_list:
-        #     print(l, len(l["text"]))
+    def _create_task_list(self):
+        # task_list = [{"id": "123", "text": "msg"}, {"id": "456", "text": "msgg"}, {"id": "789", "text": "msggg"}]
+        self._task_list.clear()
+        for _ in self._iter_tasks(self._text):
+            pass
 
     # ---------- Config ----------
 
@@ -153,9 +303,74 @@ class VoiceConverter(object):
 
         self.config.set_token(config.get_token())
         self.config.set_server(config.get_server())
+        self.config.set_endpoint_pool(config.get_endpoint_pool())
         self.config.set_voice(config.get_voice())
 
 
+    def set_polling_policy(self, policy:PollingPolicy):
+        """
+        policy：查詢任務狀態與伺服器忙碌重試的等待策略
+        """
+        if type(policy) != PollingPolicy:
+            raise TypeError("Parameter 'policy(PollingPolicy)' type error.")
+
+        self.polling_policy = policy
+
+
+    def set_cache(self, cache:SynthesisCache):
+        """
+        cache：語音合成快取，None=不使用快取
+        """
+        if (cache != None) and (type(cache) != SynthesisCache):
+            raise TypeError("Parameter 'cache(SynthesisCache)' type error.")
+
+        self._cache = cache
+
+
+    def set_journal(self, journal:TaskJournal):
+        """
+        journal：任務進度紀錄，None=不記錄
+        """
+        if (journal != None) and (type(journal) != TaskJournal):
+            raise TypeError("Parameter 'journal(TaskJournal)' type error.")
+
+        self._journal = journal
+
+
+    def set_poller(self, poller:StatusPoller):
+        """
+        poller：多個轉換器共用的任務狀態查詢服務，None=由轉換器自行查詢\n
+        使用poller時，等待策略以poller的polling policy為準
+        """
+        if (poller != None) and (type(poller) != StatusPoller):
+            raise TypeError("Parameter 'poller(StatusPoller)' type error.")
+
+        self._poller = poller
+
+
+    def set_limiter(self, limiter:RateLimiter):
+        """
+        limiter：限制送出request的速率與同時合成中的任務數量，None=不限制\n
+        使用poller時，查詢任務狀態的速率以poller的limiter為準
+        """
+        if (limiter != None) and (type(limiter) != RateLimiter):
+            raise TypeError("Parameter 'limiter(RateLimiter)' type error.")
+
+        self._api_handler.set_limiter(limiter)
+
+
+    def set_circuit_breaker(self, circuit_breaker:CircuitBreaker):
+        """
+        circuit_breaker：斷路器開啟時，送出任務與下載音檔回傳錯誤碼50399，查詢狀態視為仍在合成中，None=不使用\n
+        伺服器忙碌的重試使所有伺服器的斷路器開啟時，停止重試並回傳錯誤碼50399\n
+        使用poller時，查詢任務狀態以poller的斷路器為準
+        """
+        if (circuit_breaker != None) and (type(circuit_breaker) != CircuitBreaker):
+            raise TypeError("Parameter 'circuit_breaker(CircuitBreaker)' type error.")
+
+        self._api_handler.set_circuit_breaker(circuit_breaker)
+
+
     # ---------- Task infomation ----------
     def get_task_list(self) -> list:
         result = []
@@ -169,47 +384,331 @@ class VoiceConverter(object):
 
 
     # ---------- Task ----------
-    def run(self, interval_time = 0, is_wait_speech = False) -> ConverterResult:
+    def _retry_delays(self, interval_time:int):
+        # 伺服器忙碌時，從interval_time開始逐次拉長重試間隔
+        return self.polling_policy.delays(initial_delay=interval_time, \
+                                          max_delay=max(interval_time, self.polling_policy.max_delay))
+
+
+    def _timeout_result(self) -> json:
+        return {"data": {"status": "RUNNING"}, "code": 40899}
+
+
+    def _load_cache(self, task:dict) -> bool:
         """
-        interval_time：伺服器忙碌時，重試合成任務間隔時間，最小值=0 (不重試), 最大值=10\n
-        is_wait_speech：是否等待語音合成完成，True=執行後會等待語音合成結束，Result與(func)get_speech相同
+        查詢任務的快取，命中時將音檔存於task['data']\n
+        return：是否命中快取
+        """
+        if self._cache == None:
+            return False
+
+        task['cache_key'] = self._cache.get_key(self.config, task['text'])
+        task['data'] = self._cache.get(task['cache_key'])
+        if task['data'] == None:
+            return False
+
+        task['id'] = task['cache_key']
+        if Settings.print_log:
+            print(f"[INFO] Task hit cache, task id: '{task['id']}'")
+        return True
+
+
+    def _cached_status_result(self) -> json:
+        return {"data": {"status": "SUCCESS"}, "code": 20001}
+
+
+    def _save_cache(self, task:dict, result_json:json):
+        if (self._cache != None) and (result_json['code'] == 20001) and ('cache_key' in task):
+            self._cache.put(task['cache_key'], result_json['data'])
+
+
+    def _load_journal(self, task:dict):
+        """
+        查詢任務的journal紀錄，音檔已下載時存於task['data']\n
+        return：可以嘗試接回的紀錄，沒有紀錄、任務失敗或已載入音檔時回傳None
+        """
+        if self._journal == None:
+            return None
+
+        task['journal_key'] = self._journal.get_key(self.config, task['text'])
+        entry = self._journal.get(task['journal_key'])
+        if (entry == None) or (entry['status'] == "error"):
+            return None
+
+        if entry['status'] == "downloaded":
+            task['data'] = self._journal.load_audio(task['journal_key'])
+            if task['data'] != None:
+                task['id'] = entry['task_id']
+                if Settings.print_log:
+                    print(f"[INFO] Task audio loaded from journal, task id: '{task['id']}'")
+                return None
+        return entry
+
+
+    def _reattach_task(self, task:dict, entry:dict, result_json:json) -> bool:
+        """
+        result_json：journal紀錄中task_id的get_task_status結果\n
+        return：伺服器上的任務仍在合成或已完成時接回任務
         """
+        if (result_json['code'] != 20001) or (result_json['data']['status'] not in ["RUNNING", "SUCCESS"]):
+            return False
+
+        task['id'] = entry['task_id']
+        if Settings.print_log:
+            print(f"[INFO] Task reattached from journal, task id: '{task['id']}'")
+        return True
+
+
+    def _record_journal(self, task:dict, status:str):
+        if (self._journal != None) and ('journal_key' in task) and (task.get('data') == None):
+            self._journal.record(task['journal_key'], task['id'], status, self._api_handler.get_task_server(task['id']))
+
+
+    def _record_journal_status(self, task:dict, result_json:json):
+        """
+        任務結束時記錄合成結果，合成中(或等待逾時)不記錄
+        """
+        if (result_json['code'] != 20001) or (result_json['data']['status'] == "RUNNING"):
+            return
+        self._record_journal(task, "success" if result_json['data']['status'] == "SUCCESS" else "error")
+
+
+    def _save_journal_audio(self, task:dict, result_json:json, server_url:str):
+        if (self._journal != None) and (result_json['code'] == 20001) and ('journal_key' in task) and (task.get('data') == None):
+            self._journal.save_audio(task['journal_key'], task['id'], result_json['data'], server_url)
+
+
+    def _on_retry(self, delay:float):
+        if Settings.metrics_hook.enabled:
+            Settings.metrics_hook.on_retry(delay)
+
+
+    def _on_poll(self, result_json:json):
+        if Settings.metrics_hook.enabled:
+            data = result_json['data']
+            Settings.metrics_hook.on_poll(data['status'] if (type(data) == dict) and ('status' in data) else "UNKNOWN")
+
+
+    def _submit(self, executor:ThreadPoolExecutor, function, *args):
+        """
+        將function排入執行緒池，metrics_hook啟用時記錄等待執行的時間
+        """
+        metrics = Settings.metrics_hook
+        if not metrics.enabled:
+            return executor.submit(function, *args)
+
+        submit_time = time.perf_counter()
+        def run_queued_function():
+            metrics.on_queue_wait(time.perf_counter() - submit_time)
+            return function(*args)
+        return executor.submit(run_queued_function)
+
+
+    def _get_task_status(self, task:dict) -> json:
+        if task.get('data') != None:
+            return self._cached_status_result()
+
+        result_json = self._api_handler.get_task_status(task['id'])
+        self._on_poll(result_json)
+        return result_json
+
+
+    def _get_task_audio(self, task:dict) -> json:
+        if task.get('data') != None:
+            return {"data": task['data'], "code": 20001}
+
+        # 下載完成後不再記錄任務所屬的伺服器，需先取得
+        server_url = self._api_handler.get_task_server(task['id'])
+        result_json = self._api_handler.get_task_audio(task['id'])
+        self._save_cache(task, result_json)
+        self._save_journal_audio(task, result_json, server_url)
+        return result_json
+
+
+    def _is_keep_audio(self, task:dict) -> bool:
+        """
+        音檔已在記憶體，或需存入快取/journal時，不逐段寫入sink
+        """
+        return (task.get('data') != None) or (self._cache != None) or (self._journal != None)
+
+
+    def _write_task_audio(self, sink, result_json:json) -> json:
+        if result_json['code'] != 20001:
+            return result_json
+        Tools().save_wav_file(sink, result_json['data'])
+        return {"data": None, "code": 20001}
+
+
+    def _download_task_audio(self, task:dict, sink, block_size:int) -> json:
+        if self._is_keep_audio(task):
+            return self._write_task_audio(sink, self._get_task_audio(task))
+        return self._api_handler.download_task_audio(task['id'], sink, block_size)
+
+
+    def _start_task(self, task:dict, interval_time:int) -> json:
+        """
+        送出合成任務，伺服器忙碌時依interval_time與polling_policy重試
+        """
+        if self._load_cache(task):
+            return {"data": {"task_id": task['id']}, "code": 20001}
+
+        entry = self._load_journal(task)
+        if task.get('data') != None:
+            return {"data": {"task_id": task['id']}, "code": 20001}
+        if entry != None:
+            self._api_handler.pin_task(entry['task_id'], entry.get('server'))
+        if (entry != None) and self._reattach_task(task, entry, self._api_handler.get_task_status(entry['task_id'])):
+            return {"data": {"task_id": task['id']}, "code": 20001}
+
+        retry_delays = self._retry_delays(interval_time)
+        result_json = {"data": "task start", "code": 50301}
+        while result_json['code'] == 50301:
+            if Settings.print_log:
+                print(f"[INFO] Waitting for server...")
+
+            result_json = self._api_handler.add_ssml_task(task['text'])
+
+            if (interval_time == 0) or (result_json['code'] == 20001):
+                break
+            if (result_json['code'] == 50301) and self._api_handler.is_circuit_open("submit"):
+                # 忙碌使斷路器開啟(或試探失敗重新開啟)，不再重試註定失敗的任務
+                result_json = self._api_handler.circuit_open_result("submit")
+                break
+
+            delay = next(retry_delays, None)
+            if delay == None:
+                break
+            self._on_retry(delay)
+            time.sleep(delay)
+            # ConverVoiceRunning
+
+        if result_json['code'] == 20001:
+            task['id'] = result_json['data']['task_id']
+            self._record_journal(task, "submitted")
+            if Settings.print_log:
+                print(f"[INFO] Task start, task id: '{task['id']}'")
+
+        return result_json
+
+
+    def _wait_task(self, task:dict) -> json:
+        """
+        等待合成任務結束，查詢間隔依polling_policy決定
+        """
+        if task.get('data') != None:
+            return self._cached_status_result()
+
+        if self._poller != None:
+            return self._poller.watch(self.config, task['id'], len(task['text'])).result()
+
+        for delay in self.polling_policy.delays(len(task['text'])):
+            time.sleep(delay)
+            # ConverVoiceRunning
+            result_json = self._get_task_status(task)
+            if (type(result_json['data']) != dict) or (result_json['data'].get('status') != "RUNNING"):
+                return result_json
+
+        return self._timeout_result()
+
+
+    def _run_task(self, task:dict, interval_time:int, is_wait_speech:bool, download_executor = None) -> tuple:
+        """
+        執行單一合成任務\n
+        download_executor：指定時，任務合成完成後立即在此執行緒池下載音檔，存於task['audio']\n
+        return：(is_started, result_json)
+        """
+        result_json = self._start_task(task, interval_time)
+        if result_json['code'] != 20001:
+            return (False, result_json)
+
+        if is_wait_speech == True:
+            result_json = self._wait_task(task)
+            self._record_journal_status(task, result_json)
+            if (result_json['code'] == 20001) and (download_executor != None):
+                # 下載與後續任務的合成同時進行
+                task['audio'] = self._submit(download_executor, self._get_task_audio, task)
+
+        return (True, result_json)
+
+
+    def _clear_task_audio(self):
+        for task in self._task_list:
+            audio = task.pop('audio', None)
+            if audio != None:
+                audio.cancel()
+
+
+    def _check_speech_args(self, interval_time:int, read_ahead:int, first_chunk_limit, paragraphs):
         if type(interval_time) != int:
             raise TypeError("Parameter 'wait_time(int)' type error.")
         if (interval_time < 0) or (interval_time > 10):
             raise ValueError("Parameter 'wait_time(int)' value error.")
+        if type(read_ahead) != int:
+            raise TypeError("Parameter 'read_ahead(int)' type error.")
+        if read_ahead < 0:
+            raise ValueError("Parameter 'read_ahead(int)' value error.")
+        if first_chunk_limit != None:
+            if type(first_chunk_limit) != int:
+                raise TypeError("Parameter 'first_chunk_limit(int)' type error.")
+            if first_chunk_limit < 1:
+                raise ValueError("Parameter 'first_chunk_limit(int)' value error.")
 
-        if len(self._text) < 1:
+        if (paragraphs == None) and (len(self._text) < 1):
             raise ValueError("Text is empty.")
 
-        self.__create_task_list()
 
+    def _iter_speech_tasks(self, first_chunk_limit, paragraphs):
+        """
+        依序產生iter_speech要執行的任務，first_chunk_limit指定時第一個任務會較短
+        """
+        self._task_list.clear()
+        if paragraphs == None:
+            paragraphs = self._text
+        if first_chunk_limit != None:
+            paragraphs = self.text._split_first_paragraph(paragraphs, first_chunk_limit)
+        return self._iter_tasks(paragraphs, first_chunk_limit)
+
+
+    def _check_speech_chunk(self, chunk_index:int, task_result:tuple):
+        """
+        合成失敗時raise RuntimeError
+        """
+        is_started, result_json = task_result
+        if (not is_started) or (result_json['code'] != 20001):
+            raise RuntimeError(f"{self._translate_result_code(result_json)} (In process {chunk_index + 1})")
+
+
+    def _get_speech_chunk_data(self, chunk_index:int, result_json:json) -> bytes:
+        """
+        下載失敗時raise RuntimeError
+        """
+        if result_json['code'] != 20001:
+            raise RuntimeError(f"{self._translate_result_code(result_json)} (In process {chunk_index + 1})")
+        return result_json['data']
+
+
+    def _is_task_result_success(self, task_result:tuple, is_wait_speech:bool) -> bool:
+        is_started, result_json = task_result
+        if is_wait_speech == True:
+            return is_started and (result_json['code'] == 20001)
+        return is_started
+
+
+    def _create_run_result(self, task_results, is_wait_speech:bool) -> ConverterResult:
+        """
+        task_results：依任務順序排列的(is_started, result_json)，遇到第一個失敗的任務即停止
+        """
         status = ConverterStatus.ConverterStartUp
         task_data = []
         detail = ""
         error_msg = ""
 
-        task_number = len(self._task_list)
         task_count = 1
         result_json = {}
-        for task in self._task_list:
-            result_json = {"data": "task start", "code": 50301}
-            while result_json['code'] == 50301:
-                print(f"Waitting for server...")
-
-                result_json = self._api_handler.add_ssml_task(task['text'])
-
-                if (interval_time == 0) or (result_json['code'] == 20001):
-                    break
-
-                time.sleep(interval_time)
-                # ConverVoiceRunning
-
-            if result_json['code'] == 20001:
-                task['id'] = result_json['data']['task_id']
-                if Settings.print_log:
-                    print(f"[INFO] Task start, task id: '{task['id']}'")
-
+        # 先取得任務結果，逐步產生的任務在取得結果時已加入task_list
+        for (is_started, result_json), task in zip(task_results, self._task_list):
+            task_number = len(self._task_list)
+            if is_started:
                 status = ConverterStatus.ConverVoiceStart
                 detail = f"Start Convert: ({task_count}/{task_number})"
                 task_data.append({"id": task['id'], "data": None})
@@ -221,13 +720,6 @@ class VoiceConverter(object):
                 break
 
             if is_wait_speech == True:
-                task_status = "RUNNING"
-                while task_status == "RUNNING":
-                    result_json = self._api_handler.get_task_status(task['id'])
-                    task_status = result_json['data']['status']
-                    time.sleep(1)
-                    # ConverVoiceRunning
-
                 if result_json['code'] == 20001:
                     status = ConverterStatus.ConverVoiceCompleted
                 else:
@@ -237,10 +729,11 @@ class VoiceConverter(object):
 
             task_count += 1
 
-        if result_json['code'] == 20001:
-            if is_wait_speech == True:
-                return self.get_speech()
+        if len(self._task_list) < 1:
+            # 指定的段落沒有任何內容
+            raise ValueError("Text is empty.")
 
+        if result_json['code'] == 20001:
             return ConverterResult(status, task_data, detail, error_msg)
 
         if len(task_data) == 0:
@@ -250,13 +743,10 @@ class VoiceConverter(object):
         return ConverterResult(ConverterStatus.ConverVoiceFail, task_data, "", error_msg)
 
 
-    def check_status(self) -> ConverterResult:
+    def _create_status_result(self, status_results) -> ConverterResult:
         """
-        合成任務狀態["SUCCESS", "ERROR", "RUNNING", "NOT_EXISTS"]
+        status_results：依任務順序排列的get_task_status結果
         """
-        if len(self._task_list) < 1:
-            raise RuntimeError("Converter task list is empty, Please start convert first.")
-
         status:ConverterStatus.ConverterStartUp
         task_data = []
         detail = ""
@@ -264,9 +754,8 @@ class VoiceConverter(object):
 
         task_number = len(self._task_list)
         task_count = 1
-        for task in self._task_list:
-            result_json = self._api_handler.get_task_status(task['id'])
-
+        for task, result_json in zip(self._task_list, status_results):
+            self._record_journal_status(task, result_json)
             if result_json['code'] == 20001:
                 if Settings.print_log:
                     print(f"[INFO] Task({task['id'][:8]}) convert status '{result_json['data']['status'].lower()}'")
@@ -289,15 +778,13 @@ class VoiceConverter(object):
         return ConverterResult(status, task_data, detail, error_msg)
 
 
-    def get_speech(self) -> ConverterResult:
-        if len(self._task_list) < 1:
-            raise RuntimeError("Converter task list is empty, Please start convert first.")
-
+    def _create_speech_result(self, audio_results) -> ConverterResult:
+        """
+        audio_results：依任務順序排列的get_task_audio結果，遇到第一個失敗的任務即停止
+        """
         task_data = []
         error_msg = ""
-        for task in self._task_list:
-            result_json = self._api_handler.get_task_audio(task['id'])
-
+        for task, result_json in zip(self._task_list, audio_results):
             if result_json['code'] != 20001:
                 error_msg = self._translate_result_code(result_json)
                 task_data.append({"id": task['id'], "data": None})
@@ -305,3 +792,468 @@ class VoiceConverter(object):
 
             task_data.append({"id": task['id'], "data": result_json['data']})
         return ConverterResult(ConverterStatus.GetSpeechSuccess, task_data, "", error_msg)
+
+
+    def _get_download_sink(self, filename, task_index:int):
+        """
+        依ConverterResult.save的規則決定每個任務的檔案名稱
+        """
+        task_list_length = len(self._task_list)
+        if hasattr(filename, "write"):
+            if task_list_length > 1:
+                raise TypeError("Parameter 'filename(str)' should be str when saving more than one file.")
+            return filename
+        if type(filename) != str:
+            raise TypeError("Parameter 'filename(str)' type error.")
+
+        if task_list_length == 1:
+            return filename
+        return f"{filename}-{task_index + 1}"
+
+
+    def _create_download_result(self, download_results) -> ConverterResult:
+        """
+        download_results：依任務順序排列的download_task_audio結果，遇到第一個失敗的任務即停止
+        """
+        task_data = []
+        for task, result_json in zip(self._task_list, download_results):
+            task_data.append({"id": task['id'], "data": None})
+            if result_json['code'] != 20001:
+                error_msg = self._translate_result_code(result_json)
+                return ConverterResult(ConverterStatus.GetSpeechFail, task_data, "", error_msg)
+        return ConverterResult(ConverterStatus.GetSpeechSuccess, task_data, "", "")
+
+
+    def _iter_task_results(self, run_task, max_workers:int, tasks = None):
+        """
+        run_task：執行單一任務的function，參數為task\n
+        tasks：要執行的任務，未指定時為task_list，可為逐步產生任務的generator\n
+        依任務順序回傳每個任務的執行結果，max_workers > 1 時以執行緒池同時執行
+        """
+        if tasks == None:
+            tasks = self._task_list
+
+        if max_workers == 1:
+            for task in tasks:
+                yield run_task(task)
+            return
+
+        # 最多預先送出2倍max_workers個任務，逐步產生的任務不需一次全部建立
+        read_ahead = max_workers * 2
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = deque()
+            try:
+                for task in tasks:
+                    futures.append(self._submit(executor, run_task, task))
+                    if len(futures) >= read_ahead:
+                        yield futures.popleft().result()
+                while len(futures) > 0:
+                    yield futures.popleft().result()
+            finally:
+                # 中途停止時，取消尚未開始的任務
+                for future in futures:
+                    future.cancel()
+
+
+    def run(self, interval_time = 0, is_wait_speech = False, max_workers = 1, paragraphs = None) -> ConverterResult:
+        """
+        interval_time：伺服器忙碌時，重試合成任務間隔時間，最小值=0 (不重試), 最大值=10\n
+        is_wait_speech：是否等待語音合成完成，True=執行後會等待語音合成結束，Result與(func)get_speech相同\n
+        max_workers：同時執行的合成任務數量，預設為1 (依序執行)，Result中的任務順序與文章順序相同\n
+        paragraphs：要合成的TextParagraph(例如text.iter_text_file的回傳值)，指定時改為合成這些段落，\n
+                    段落邊讀取邊組成任務並送出，不需等待全部段落產生
+        """
+        if type(interval_time) != int:
+            raise TypeError("Parameter 'wait_time(int)' type error.")
+        if (interval_time < 0) or (interval_time > 10):
+            raise ValueError("Parameter 'wait_time(int)' value error.")
+        if type(max_workers) != int:
+            raise TypeError("Parameter 'max_workers(int)' type error.")
+        if max_workers < 1:
+            raise ValueError("Parameter 'max_workers(int)' value error.")
+
+        if paragraphs == None:
+            if len(self._text) < 1:
+                raise ValueError("Text is empty.")
+            self._create_task_list()
+            tasks = self._task_list
+        else:
+            self._task_list.clear()
+            tasks = self._iter_tasks(paragraphs)
+
+        # is_wait_speech = True時，每個任務合成完成即開始下載音檔，不等待全部任務完成
+        with ThreadPoolExecutor(max_workers=max_workers) as download_executor:
+            run_task = lambda task: self._run_task(task, interval_time, is_wait_speech, download_executor)
+            task_results = self._iter_task_results(run_task, max_workers, tasks)
+            result = self._create_run_result(task_results, is_wait_speech)
+            task_results.close()
+
+            if is_wait_speech and (result.status == ConverterStatus.ConverVoiceCompleted):
+                audio_results = (task.pop('audio').result() for task in self._task_list)
+                result = self._create_speech_result(audio_results)
+            self._clear_task_audio()
+
+        return result
+
+
+    def iter_speech(self, interval_time = 0, read_ahead = 2, first_chunk_limit = None, paragraphs = None):
+        """
+        interval_time：伺服器忙碌時，重試合成任務間隔時間，最小值=0 (不重試), 最大值=10\n
+        read_ahead：取得目前音檔時，同時預先合成的後續任務數量，最小值=0 (依序合成)\n
+        first_chunk_limit：第一個任務的文字長度上限，較短的第一個任務可以更快取得第一段音檔，未指定時與其他任務相同\n
+        paragraphs：要合成的TextParagraph，與(func)run相同\n
+        return：依文章順序產生(chunk_index, wav_bytes)的generator，每個任務下載完成即回傳，任務失敗時raise RuntimeError
+        """
+        self._check_speech_args(interval_time, read_ahead, first_chunk_limit, paragraphs)
+        return self._iter_speech(interval_time, read_ahead, first_chunk_limit, paragraphs)
+
+
+    def _get_speech_chunk(self, chunk_index:int, future) -> tuple:
+        self._check_speech_chunk(chunk_index, future.result())
+        result_json = self._task_list[chunk_index].pop('audio').result()
+        return (chunk_index, self._get_speech_chunk_data(chunk_index, result_json))
+
+
+    def _iter_speech(self, interval_time:int, read_ahead:int, first_chunk_limit, paragraphs):
+        tasks = self._iter_speech_tasks(first_chunk_limit, paragraphs)
+        # 同時送出的任務最多read_ahead + 1個(目前取得的任務與預先合成的任務)
+        executor = ThreadPoolExecutor(max_workers=read_ahead + 1)
+        download_executor = ThreadPoolExecutor(max_workers=read_ahead + 1)
+        futures = deque()
+        try:
+            for task in tasks:
+                futures.append(self._submit(executor, self._run_task, task, interval_time, True, download_executor))
+                if len(futures) <= read_ahead:
+                    continue
+
+                chunk_index = len(self._task_list) - len(futures)
+                yield self._get_speech_chunk(chunk_index, futures.popleft())
+
+            while len(futures) > 0:
+                chunk_index = len(self._task_list) - len(futures)
+                yield self._get_speech_chunk(chunk_index, futures.popleft())
+        finally:
+            # 使用者中途停止或任務失敗時，取消尚未執行的任務與下載，不等待執行中的request結束
+            for future in futures:
+                future.cancel()
+            self._clear_task_audio()
+            executor.shutdown(wait=False)
+            download_executor.shutdown(wait=False)
+
+        if len(self._task_list) < 1:
+            raise ValueError("Text is empty.")
+
+
+    def check_status(self) -> ConverterResult:
+        """
+        合成任務狀態["SUCCESS", "ERROR", "RUNNING", "NOT_EXISTS"]
+        """
+        if len(self._task_list) < 1:
+            raise RuntimeError("Converter task list is empty, Please start convert first.")
+
+        status_results = (self._get_task_status(task) for task in self._task_list)
+        return self._create_status_result(status_results)
+
+
+    def get_speech(self) -> ConverterResult:
+        if len(self._task_list) < 1:
+            raise RuntimeError("Converter task list is empty, Please start convert first.")
+
+        audio_results = (self._get_task_audio(task) for task in self._task_list)
+        return self._create_speech_result(audio_results)
+
+
+    def download_speech(self, filename = "aivoice", block_size = Settings.read_block_size) -> ConverterResult:
+        """
+        filename：檔案名稱，預設為'aivoice'，命名規則與ConverterResult.save相同，只有一個音檔時也可傳入可寫入的binary stream\n
+        block_size：每次寫入的bytes數\n
+        逐段下載音檔並直接寫入檔案，不會將整個音檔留在記憶體，Result中的data為None\n
+        有設定快取或journal時，音檔會先完整下載並存入快取/journal，再寫入檔案
+        """
+        if len(self._task_list) < 1:
+            raise RuntimeError("Converter task list is empty, Please start convert first.")
+
+        sinks = [self._get_download_sink(filename, i) for i in range(len(self._task_list))]
+        download_results = (self._download_task_audio(task, sink, block_size) for task, sink in zip(self._task_list, sinks))
+        return self._create_download_result(download_results)
+
+
+class AsyncVoiceConverter(VoiceConverter):
+    """
+    非阻塞版本的VoiceConverter (需要安裝aiohttp)，run/check_status/get_speech皆為coroutine\n
+    session：共用的aiohttp.ClientSession，多個converter共用同一個session即共用連線池
+    """
+    _api_handler:AsyncRestfulApiHandler
+
+    def _create_api_handler(self, session) -> AsyncRestfulApiHandler:
+        return AsyncRestfulApiHandler(self.config, session)
+
+
+    async def close(self):
+        await self._api_handler.close()
+
+
+    def __enter__(self):
+        raise TypeError("AsyncVoiceConverter should be used with 'async with' instead of 'with'.")
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        raise TypeError("AsyncVoiceConverter should be used with 'async with' instead of 'with'.")
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+    # ---------- Task ----------
+    async def _get_task_status(self, task:dict) -> json:
+        if task.get('data') != None:
+            return self._cached_status_result()
+
+        result_json = await self._api_handler.get_task_status(task['id'])
+        self._on_poll(result_json)
+        return result_json
+
+
+    async def _get_task_audio(self, task:dict) -> json:
+        if task.get('data') != None:
+            return {"data": task['data'], "code": 20001}
+
+        server_url = self._api_handler.get_task_server(task['id'])
+        result_json = await self._api_handler.get_task_audio(task['id'])
+        self._save_cache(task, result_json)
+        self._save_journal_audio(task, result_json, server_url)
+        return result_json
+
+
+    async def _download_task_audio(self, task:dict, sink, block_size:int) -> json:
+        if self._is_keep_audio(task):
+            return self._write_task_audio(sink, await self._get_task_audio(task))
+        return await self._api_handler.download_task_audio(task['id'], sink, block_size)
+
+
+    async def _start_task(self, task:dict, interval_time:int) -> json:
+        if self._load_cache(task):
+            return {"data": {"task_id": task['id']}, "code": 20001}
+
+        entry = self._load_journal(task)
+        if task.get('data') != None:
+            return {"data": {"task_id": task['id']}, "code": 20001}
+        if entry != None:
+            self._api_handler.pin_task(entry['task_id'], entry.get('server'))
+        if (entry != None) and self._reattach_task(task, entry, await self._api_handler.get_task_status(entry['task_id'])):
+            return {"data": {"task_id": task['id']}, "code": 20001}
+
+        retry_delays = self._retry_delays(interval_time)
+        result_json = {"data": "task start", "code": 50301}
+        while result_json['code'] == 50301:
+            if Settings.print_log:
+                print(f"[INFO] Waitting for server...")
+
+            result_json = await self._api_handler.add_ssml_task(task['text'])
+
+            if (interval_time == 0) or (result_json['code'] == 20001):
+                break
+            if (result_json['code'] == 50301) and self._api_handler.is_circuit_open("submit"):
+                # 忙碌使斷路器開啟(或試探失敗重新開啟)，不再重試註定失敗的任務
+                result_json = self._api_handler.circuit_open_result("submit")
+                break
+
+            delay = next(retry_delays, None)
+            if delay == None:
+                break
+            self._on_retry(delay)
+            await asyncio.sleep(delay)
+
+        if result_json['code'] == 20001:
+            task['id'] = result_json['data']['task_id']
+            self._record_journal(task, "submitted")
+            if Settings.print_log:
+                print(f"[INFO] Task start, task id: '{task['id']}'")
+
+        return result_json
+
+
+    async def _wait_task(self, task:dict) -> json:
+        if task.get('data') != None:
+            return self._cached_status_result()
+
+        if self._poller != None:
+            return await asyncio.wrap_future(self._poller.watch(self.config, task['id'], len(task['text'])))
+
+        for delay in self.polling_policy.delays(len(task['text'])):
+            await asyncio.sleep(delay)
+            result_json = await self._get_task_status(task)
+            if (type(result_json['data']) != dict) or (result_json['data'].get('status') != "RUNNING"):
+                return result_json
+
+        return self._timeout_result()
+
+
+    async def _run_task(self, task:dict, interval_time:int, is_wait_speech:bool) -> tuple:
+        result_json = await self._start_task(task, interval_time)
+        if result_json['code'] != 20001:
+            return (False, result_json)
+
+        if is_wait_speech == True:
+            result_json = await self._wait_task(task)
+            self._record_journal_status(task, result_json)
+            if result_json['code'] == 20001:
+                # 合成完成後立即下載音檔，下載與後續任務的合成同時進行
+                task['audio'] = asyncio.ensure_future(self._get_task_audio(task))
+
+        return (True, result_json)
+
+
+    async def _gather_task_results(self, interval_time:int, is_wait_speech:bool, max_workers:int, tasks) -> list:
+        """
+        tasks：要執行的任務，可為逐步產生任務的generator\n
+        同時執行最多max_workers個任務，依任務順序收集結果，遇到第一個失敗的任務即取消其餘任務
+        """
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def run_with_limit(task:dict) -> tuple:
+            queue_time = time.perf_counter()
+            async with semaphore:
+                if Settings.metrics_hook.enabled:
+                    Settings.metrics_hook.on_queue_wait(time.perf_counter() - queue_time)
+                return await self._run_task(task, interval_time, is_wait_speech)
+
+        async def collect_result(future) -> bool:
+            task_results.append(await future)
+            return self._is_task_result_success(task_results[-1], is_wait_speech)
+
+        # 最多預先建立2倍max_workers個任務，逐步產生的任務不需一次全部建立
+        read_ahead = max_workers * 2
+        futures = deque()
+        task_results = []
+        try:
+            for task in tasks:
+                futures.append(asyncio.ensure_future(run_with_limit(task)))
+                if (len(futures) >= read_ahead) and (not await collect_result(futures.popleft())):
+                    return task_results
+            while len(futures) > 0:
+                if not await collect_result(futures.popleft()):
+                    return task_results
+        finally:
+            for future in futures:
+                future.cancel()
+        return task_results
+
+
+    async def run(self, interval_time = 0, is_wait_speech = False, max_workers = 1, paragraphs = None) -> ConverterResult:
+        """
+        interval_time：伺服器忙碌時，重試合成任務間隔時間，最小值=0 (不重試), 最大值=10\n
+        is_wait_speech：是否等待語音合成完成，True=執行後會等待語音合成結束，Result與(func)get_speech相同\n
+        max_workers：同時執行的合成任務數量，預設為1 (依序執行)，Result中的任務順序與文章順序相同\n
+        paragraphs：要合成的TextParagraph，與VoiceConverter.run相同
+        """
+        if type(interval_time) != int:
+            raise TypeError("Parameter 'wait_time(int)' type error.")
+        if (interval_time < 0) or (interval_time > 10):
+            raise ValueError("Parameter 'wait_time(int)' value error.")
+        if type(max_workers) != int:
+            raise TypeError("Parameter 'max_workers(int)' type error.")
+        if max_workers < 1:
+            raise ValueError("Parameter 'max_workers(int)' value error.")
+
+        if paragraphs == None:
+            if len(self._text) < 1:
+                raise ValueError("Text is empty.")
+            self._create_task_list()
+            tasks = self._task_list
+        else:
+            self._task_list.clear()
+            tasks = self._iter_tasks(paragraphs)
+
+        task_results = await self._gather_task_results(interval_time, is_wait_speech, max_workers, tasks)
+        result = self._create_run_result(task_results, is_wait_speech)
+
+        if is_wait_speech and (result.status == ConverterStatus.ConverVoiceCompleted):
+            audio_results = await asyncio.gather(*[task.pop('audio') for task in self._task_list])
+            result = self._create_speech_result(audio_results)
+        self._clear_task_audio()
+
+        return result
+
+
+    def iter_speech(self, interval_time = 0, read_ahead = 2, first_chunk_limit = None, paragraphs = None):
+        """
+        interval_time：伺服器忙碌時，重試合成任務間隔時間，最小值=0 (不重試), 最大值=10\n
+        read_ahead：取得目前音檔時，同時預先合成的後續任務數量，最小值=0 (依序合成)\n
+        first_chunk_limit：第一個任務的文字長度上限，較短的第一個任務可以更快取得第一段音檔，未指定時與其他任務相同\n
+        paragraphs：要合成的TextParagraph，與(func)run相同\n
+        return：依文章順序產生(chunk_index, wav_bytes)的async generator，使用async for取得，任務失敗時raise RuntimeError
+        """
+        self._check_speech_args(interval_time, read_ahead, first_chunk_limit, paragraphs)
+        return self._iter_speech(interval_time, read_ahead, first_chunk_limit, paragraphs)
+
+
+    async def _iter_speech(self, interval_time:int, read_ahead:int, first_chunk_limit, paragraphs):
+        tasks = self._iter_speech_tasks(first_chunk_limit, paragraphs)
+        futures = deque()
+        try:
+            for task in tasks:
+                futures.append(asyncio.ensure_future(self._run_task(task, interval_time, True)))
+                if len(futures) <= read_ahead:
+                    continue
+
+                chunk_index = len(self._task_list) - len(futures)
+                yield await self._get_speech_chunk(chunk_index, futures.popleft())
+
+            while len(futures) > 0:
+                chunk_index = len(self._task_list) - len(futures)
+                yield await self._get_speech_chunk(chunk_index, futures.popleft())
+        finally:
+            # 使用者中途停止或任務失敗時，取消尚未完成的任務與下載
+            for future in futures:
+                future.cancel()
+            self._clear_task_audio()
+
+        if len(self._task_list) < 1:
+            raise ValueError("Text is empty.")
+
+
+    async def _get_speech_chunk(self, chunk_index:int, future:asyncio.Future) -> tuple:
+        self._check_speech_chunk(chunk_index, await future)
+        result_json = await self._task_list[chunk_index].pop('audio')
+        return (chunk_index, self._get_speech_chunk_data(chunk_index, result_json))
+
+
+    async def check_status(self) -> ConverterResult:
+        """
+        合成任務狀態["SUCCESS", "ERROR", "RUNNING", "NOT_EXISTS"]
+        """
+        if len(self._task_list) < 1:
+            raise RuntimeError("Converter task list is empty, Please start convert first.")
+
+        status_results = await asyncio.gather(*[self._get_task_status(task) for task in self._task_list])
+        return self._create_status_result(status_results)
+
+
+    async def get_speech(self) -> ConverterResult:
+        if len(self._task_list) < 1:
+            raise RuntimeError("Converter task list is empty, Please start convert first.")
+
+        audio_results = await asyncio.gather(*[self._get_task_audio(task) for task in self._task_list])
+        return self._create_speech_result(audio_results)
+
+
+    async def download_speech(self, filename = "aivoice", block_size = Settings.read_block_size) -> ConverterResult:
+        """
+        filename：檔案名稱，預設為'aivoice'，命名規則與ConverterResult.save相同，只有一個音檔時也可傳入可寫入的binary stream\n
+        block_size：每次寫入的bytes數\n
+        逐段下載音檔並直接寫入檔案，不會將整個音檔留在記憶體，Result中的data為None\n
+        有設定快取或journal時，音檔會先完整下載並存入快取/journal，再寫入檔案
+        """
+        if len(self._task_list) < 1:
+            raise RuntimeError("Converter task list is empty, Please start convert first.")
+
+        sinks = [self._get_download_sink(filename, i) for i in range(len(self._task_list))]
+        download_results = await asyncio.gather(*[self._download_task_audio(task, sink, block_size) \
+                                                  for task, sink in zip(self._task_list, sinks)])
+        return self._create_download_result(download_results)
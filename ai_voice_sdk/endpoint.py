@@ -0,0 +1,176 @@
+import time
+import random
+import threading
+from collections import OrderedDict
+
+
+class EndpointPool(object):
+    """
+    多個合成伺服器的endpoint pool，每次送出任務時依routing選擇endpoint，查詢狀態與下載音檔固定送到送出該任務的endpoint\n
+    server_urls：伺服器網址，第一個為預設endpoint(無法得知任務所屬的endpoint時使用)\n
+    routing："least_outstanding" = 選擇合成中任務最少的endpoint，"latency" = 依平均回應時間與合成中任務數量加權隨機選擇\n
+    endpoint連續失敗(連線錯誤、逾時、5xx)max_failures次後，cooldown秒內不會被選擇，所有endpoint都失敗時選擇最快恢復的endpoint\n
+    設定檔被複製時共用同一個pool，使用同一個設定檔的轉換器一起計算任務數量與健康狀態
+    """
+    max_failures = 3
+    cooldown = 30.0 # 秒
+
+    _routing_types = ["least_outstanding", "latency"]
+    _latency_weight = 0.2 # 平均回應時間的指數移動平均權重
+    _max_pinned_tasks = 100000 # 記錄任務所屬endpoint的數量上限，超過時移除最舊的紀錄
+
+    _server_urls:list
+    _routing:str
+    _endpoints:dict # {server_url: {"outstanding", "latency", "failures", "retry_time"}}
+    _tasks:OrderedDict # {task_id: [server_url, is_running]}
+
+    def __init__(self, server_urls:list, routing = "least_outstanding") -> None:
+        if type(server_urls) != list:
+            raise TypeError("Parameter 'server_urls(list)' type error.")
+        if len(server_urls) < 1:
+            raise ValueError("Parameter 'server_urls(list)' should not be empty.")
+        for server_url in server_urls:
+            if type(server_url) != str:
+                raise TypeError("Parameter 'server_urls(list)' type error.")
+            if server_url.find("http") != 0:
+                raise ValueError("Please check url, it should be with 'http' or 'https'.")
+        if routing not in self._routing_types:
+            raise ValueError(f"Parameter 'routing(str)' should be one of {self._routing_types}.")
+
+        self._server_urls = list(dict.fromkeys(server_urls))
+        self._routing = routing
+        self._lock = threading.Lock()
+        self._endpoints = {server_url: {"outstanding": 0, "latency": None, "failures": 0, "retry_time": 0.0} \
+                           for server_url in self._server_urls}
+        self._tasks = OrderedDict()
+
+
+    def __deepcopy__(self, memo):
+        # pool記錄的是執行中的狀態，複製設定檔時共用
+        return self
+
+
+    def get_servers(self) -> list:
+        return list(self._server_urls)
+
+
+    def get_routing(self) -> str:
+        return self._routing
+
+
+    def _get_default_latency(self) -> float:
+        # 尚未量測到回應時間的endpoint視為與目前最快的endpoint相同，讓新的endpoint也會被選到
+        latencies = [endpoint['latency'] for endpoint in self._endpoints.values() if endpoint['latency'] != None]
+        return min(latencies) if len(latencies) > 0 else 1.0
+
+
+    def select(self, exclude_urls = ()) -> str:
+        """
+        exclude_urls：不選擇的endpoint(例如剛才無法連線)，全部排除時從所有endpoint選擇\n
+        return：送出新任務的endpoint
+        """
+        with self._lock:
+            now = time.monotonic()
+            server_urls = [server_url for server_url in self._server_urls if server_url not in exclude_urls]
+            if len(server_urls) == 0:
+                server_urls = self._server_urls
+            healthy_urls = [server_url for server_url in server_urls if self._endpoints[server_url]['retry_time'] <= now]
+            if len(healthy_urls) == 0:
+                return min(server_urls, key=lambda server_url: self._endpoints[server_url]['retry_time'])
+
+            default_latency = self._get_default_latency()
+            def get_latency(server_url:str) -> float:
+                latency = self._endpoints[server_url]['latency']
+                return default_latency if latency == None else latency
+
+            if self._routing == "latency":
+                weights = [1 / (max(get_latency(server_url), 0.001) * (self._endpoints[server_url]['outstanding'] + 1)) \
+                           for server_url in healthy_urls]
+                return random.choices(healthy_urls, weights)[0]
+
+            # 任務數量相同時選擇較快的endpoint，再相同時隨機選擇
+            random.shuffle(healthy_urls)
+            return min(healthy_urls, key=lambda server_url: (self._endpoints[server_url]['outstanding'], get_latency(server_url)))
+
+
+    def on_response(self, server_url:str, status_code:int, latency:float):
+        """
+        收到伺服器回應時呼叫，5xx(忙碌的503除外)視為失敗\n
+        latency：送出request到收到response header的時間(秒)
+        """
+        if (status_code >= 500) and (status_code != 503):
+            self.on_failure(server_url)
+            return
+
+        with self._lock:
+            endpoint = self._endpoints.get(server_url)
+            if endpoint == None:
+                return
+            endpoint['failures'] = 0
+            endpoint['retry_time'] = 0.0
+            if endpoint['latency'] == None:
+                endpoint['latency'] = latency
+            else:
+                endpoint['latency'] += self._latency_weight * (latency - endpoint['latency'])
+
+
+    def on_failure(self, server_url:str):
+        """
+        連線錯誤或逾時時呼叫
+        """
+        with self._lock:
+            endpoint = self._endpoints.get(server_url)
+            if endpoint == None:
+                return
+            endpoint['failures'] += 1
+            if endpoint['failures'] >= self.max_failures:
+                # 恢復後再失敗一次即重新停用
+                endpoint['retry_time'] = time.monotonic() + self.cooldown
+
+
+    def pin_task(self, task_id:str, server_url:str):
+        """
+        記錄任務所屬的endpoint，並計入該endpoint合成中的任務數量
+        """
+        with self._lock:
+            if (server_url not in self._endpoints) or (task_id in self._tasks):
+                return
+
+            self._tasks[task_id] = [server_url, True]
+            self._endpoints[server_url]['outstanding'] += 1
+            if len(self._tasks) > self._max_pinned_tasks:
+                old_task = self._tasks.popitem(last=False)[1]
+                if old_task[1]:
+                    self._endpoints[old_task[0]]['outstanding'] -= 1
+
+
+    def get_task_server(self, task_id:str) -> str:
+        """
+        return：任務所屬的endpoint，沒有紀錄時回傳預設endpoint
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+            return self._server_urls[0] if task == None else task[0]
+
+
+    def finish_task(self, task_id:str):
+        """
+        任務合成結束時呼叫，不再計入合成中的任務數量\n
+        任務所屬endpoint的紀錄會保留(之後查詢狀態或重新下載音檔仍需要)，超過_max_pinned_tasks時才移除最舊的紀錄
+        """
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if (task != None) and task[1]:
+                task[1] = False
+                self._endpoints[task[0]]['outstanding'] -= 1
+
+
+    def get_stats(self) -> dict:
+        """
+        return：{server_url: {"outstanding", "latency", "failures", "is_healthy"}}
+        """
+        with self._lock:
+            now = time.monotonic()
+            return {server_url: {"outstanding": endpoint['outstanding'], "latency": endpoint['latency'],
+                                 "failures": endpoint['failures'], "is_healthy": endpoint['retry_time'] <= now} \
+                    for server_url, endpoint in self._endpoints.items()}
@@ -0,0 +1,156 @@
+import os
+import json
+import threading
+
+from .config import ConverterConfig
+
+class TaskJournal(object):
+    """
+    記錄合成任務進度的journal，轉換中斷後重新執行時，可以接回伺服器上尚未結束的任務，並只下載缺少的音檔\n
+    journal_dir：journal資料夾，進度記錄於journal.jsonl，下載完成的音檔存為{key}.wav\n
+    每筆紀錄為 {"key": 段落hash, "task_id": 任務id, "status": ["submitted", "success", "error", "downloaded"], "audio": 音檔路徑, "server": 任務所屬的伺服器}\n
+    同一個journal可以給多個執行緒使用，但不可同時給多個process使用
+    """
+    _journal_dir:str
+    _entries:dict # {key: entry}
+    _line_count:int
+
+    _journal_file_name = "journal.jsonl"
+
+    def __init__(self, journal_dir:str) -> None:
+        if type(journal_dir) != str:
+            raise TypeError("Parameter 'journal_dir(str)' type error.")
+
+        self._journal_dir = journal_dir
+        self._lock = threading.Lock()
+
+        os.makedirs(journal_dir, exist_ok=True)
+        self._load()
+
+
+    def _get_journal_path(self) -> str:
+        return os.path.join(self._journal_dir, self._journal_file_name)
+
+
+    def _get_audio_path(self, key:str) -> str:
+        return os.path.join(self._journal_dir, f"{key}.wav")
+
+
+    def _load(self):
+        self._entries = {}
+        self._line_count = 0
+        journal_path = self._get_journal_path()
+        if os.path.exists(journal_path):
+            with open(journal_path, 'r', encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 寫入到一半中斷的最後一行
+                        continue
+                    self._entries[entry['key']] = entry
+                    self._line_count += 1
+
+        # 被覆蓋的舊紀錄太多時，重新整理journal
+        if self._line_count > 2 * len(self._entries) + 100:
+            self._compact()
+
+
+    def _append(self, entry:dict):
+        # 呼叫前需持有self._lock
+        self._entries[entry['key']] = entry
+        with open(self._get_journal_path(), 'a', encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._line_count += 1
+
+
+    def _compact(self):
+        journal_path = self._get_journal_path()
+        temp_path = f"{journal_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding="utf-8") as f:
+            for entry in self._entries.values():
+                f.write(json.dumps(entry) + "\n")
+        os.replace(temp_path, journal_path)
+        self._line_count = len(self._entries)
+
+
+    def get_key(self, config:ConverterConfig, ssml_text:str) -> str:
+        """
+        config：轉換器設定檔\n
+        ssml_text：任務的SSML內容
+        """
+        return config.get_synthesis_key(ssml_text)
+
+
+    def get(self, key:str) -> dict:
+        """
+        return：段落最新的紀錄，沒有紀錄時回傳None
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry == None else dict(entry)
+
+
+    def record(self, key:str, task_id:str, status:str, server = None):
+        """
+        status：["submitted", "success", "error"]\n
+        server：任務所屬的伺服器網址
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry != None) and (entry['task_id'] == task_id) and (entry['status'] == status):
+                return
+            self._append({"key": key, "task_id": task_id, "status": status, "audio": None, "server": server})
+
+
+    def save_audio(self, key:str, task_id:str, data:bytes, server = None):
+        """
+        儲存下載完成的音檔，並記錄為"downloaded"
+        """
+        audio_path = self._get_audio_path(key)
+        temp_path = f"{audio_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, audio_path)
+
+        with self._lock:
+            self._append({"key": key, "task_id": task_id, "status": "downloaded", "audio": audio_path, "server": server})
+
+
+    def load_audio(self, key:str) -> bytes:
+        """
+        return：已下載的音檔，沒有音檔時回傳None
+        """
+        entry = self.get(key)
+        if (entry == None) or (entry['audio'] == None):
+            return None
+        try:
+            with open(entry['audio'], 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+
+    def compact(self):
+        """
+        移除被覆蓋的舊紀錄
+        """
+        with self._lock:
+            self._compact()
+
+
+    def clear(self):
+        """
+        清除所有紀錄與音檔
+        """
+        with self._lock:
+            for entry in self._entries.values():
+                if entry['audio'] != None:
+                    try:
+                        os.remove(entry['audio'])
+                    except FileNotFoundError:
+                        pass
+            self._entries.clear()
+            self._compact()
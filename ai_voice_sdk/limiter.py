@@ -0,0 +1,251 @@
+import json
+import time
+import uuid
+import asyncio
+import hashlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None # Windows
+
+from .config import Settings
+
+
+class _MemoryState(object):
+    """
+    只在同一個process內共用的限制狀態
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._state = {"buckets": {}, "tasks": {}}
+
+
+    @contextmanager
+    def open(self):
+        with self._lock:
+            yield self._state
+
+
+class _FileState(object):
+    """
+    以檔案鎖在同一台主機的所有process間共用的限制狀態，狀態以json存在lock_file
+    """
+    def __init__(self, lock_file:str) -> None:
+        self._lock_file = lock_file
+        self._lock = threading.Lock()
+
+
+    @contextmanager
+    def open(self):
+        with self._lock, open(self._lock_file, 'a+', encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                content = f.read()
+                try:
+                    state = json.loads(content) if content else {}
+                except ValueError:
+                    # 狀態檔損毀時，重新開始計算
+                    state = {}
+                state.setdefault("buckets", {})
+                state.setdefault("tasks", {})
+
+                yield state
+
+                f.seek(0)
+                f.truncate()
+                json.dump(state, f)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RateLimiter(object):
+    """
+    client端的request速率限制，以token bucket限制每秒送出的request數量，並限制同時合成中的任務數量\n
+    所有限制都依token(帳號)分開計算，submit、status、download各自使用不同的bucket\n
+    rates：每種操作每秒最多送出的request數量，例如{"submit": 2.0, "status": 10.0, "download": 5.0}，未列出的操作不限制\n
+    burst：每種操作最多可累積的request數量，未指定時為該操作一秒的數量(至少為1)\n
+    max_in_flight：同一個token同時合成中(已送出、尚未查詢到結束或下載)的任務數量上限，None=不限制\n
+    lock_file：指定時以檔案鎖在同一台主機的所有process間共用限制(不支援Windows)，未指定時只在同一個process內共用\n
+    task_ttl：任務一直沒有回報結束時，最多佔用名額的時間(秒)，避免process中斷後名額無法釋放
+    """
+    _rates:dict
+    _burst:dict
+    _max_in_flight:int
+    _task_ttl:float
+
+    _wait_interval = 0.05 # 等待任務名額時，重新檢查的間隔(秒)
+
+    def __init__(self, rates = None, burst = None, max_in_flight = None, lock_file = None, task_ttl = 600) -> None:
+        rates = {} if rates == None else rates
+        burst = {} if burst == None else burst
+        if type(rates) != dict:
+            raise TypeError("Parameter 'rates(dict)' type error.")
+        if type(burst) != dict:
+            raise TypeError("Parameter 'burst(dict)' type error.")
+        for operation, rate in rates.items():
+            if operation not in Settings.timeout:
+                raise ValueError(f"Parameter 'rates(dict)' value error, unknown operation '{operation}'.")
+            if (type(rate) not in [int, float]) or (rate <= 0):
+                raise ValueError("Parameter 'rates(dict)' value error.")
+        for operation, size in burst.items():
+            if (operation not in rates) or (type(size) not in [int, float]) or (size < 1):
+                raise ValueError("Parameter 'burst(dict)' value error.")
+        if max_in_flight != None:
+            if type(max_in_flight) != int:
+                raise TypeError("Parameter 'max_in_flight(int)' type error.")
+            if max_in_flight < 1:
+                raise ValueError("Parameter 'max_in_flight(int)' value error.")
+        if (type(task_ttl) not in [int, float]) or (task_ttl <= 0):
+            raise ValueError("Parameter 'task_ttl(float)' value error.")
+
+        self._rates = {operation: float(rate) for operation, rate in rates.items()}
+        self._burst = {operation: float(burst.get(operation, max(1.0, rate))) for operation, rate in rates.items()}
+        self._max_in_flight = max_in_flight
+        self._task_ttl = task_ttl
+
+        if lock_file == None:
+            self._state = _MemoryState()
+            self._clock = time.monotonic
+        else:
+            if fcntl == None:
+                raise RuntimeError("RateLimiter 'lock_file' is not supported on this platform.")
+            self._state = _FileState(lock_file)
+            # 不同process需使用相同的時鐘
+            self._clock = time.time
+
+
+    def _token_key(self, token:str) -> str:
+        # 狀態檔中不保存token原文
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+    def _try_acquire(self, token:str, operation:str) -> float:
+        """
+        return：0 = 取得request名額，否則為需要等待的時間
+        """
+        rate = self._rates[operation]
+        burst = self._burst[operation]
+        key = f"{self._token_key(token)}:{operation}"
+        with self._state.open() as state:
+            now = self._clock()
+            tokens, last_time = state['buckets'].get(key, (burst, now))
+            tokens = min(burst, tokens + max(0.0, now - last_time) * rate)
+            if tokens >= 1:
+                state['buckets'][key] = (tokens - 1, now)
+                return 0
+            state['buckets'][key] = (tokens, now)
+            return (1 - tokens) / rate
+
+
+    def _try_reserve_task(self, token:str):
+        """
+        return：取得任務名額時回傳slot_id，否則回傳None
+        """
+        with self._state.open() as state:
+            now = self._clock()
+            tasks = state['tasks'].setdefault(self._token_key(token), {})
+            for task_id in [task_id for task_id, expire_time in tasks.items() if expire_time <= now]:
+                del tasks[task_id]
+
+            if len(tasks) >= self._max_in_flight:
+                return None
+
+            slot_id = f"slot-{uuid.uuid4().hex}"
+            tasks[slot_id] = now + self._task_ttl
+            return slot_id
+
+
+    def acquire(self, token:str, operation:str):
+        """
+        operation：["submit", "status", "download"]\n
+        等待直到可以送出一個request
+        """
+        if operation not in self._rates:
+            return
+
+        wait_time = self._try_acquire(token, operation)
+        while wait_time > 0:
+            time.sleep(wait_time)
+            wait_time = self._try_acquire(token, operation)
+
+
+    async def acquire_async(self, token:str, operation:str):
+        """
+        非阻塞版本的acquire
+        """
+        if operation not in self._rates:
+            return
+
+        wait_time = self._try_acquire(token, operation)
+        while wait_time > 0:
+            await asyncio.sleep(wait_time)
+            wait_time = self._try_acquire(token, operation)
+
+
+    def reserve_task(self, token:str):
+        """
+        等待直到同時合成中的任務數量低於max_in_flight\n
+        return：任務名額的slot_id，送出任務後需以bind_task或release_task處理，不限制時回傳None
+        """
+        if self._max_in_flight == None:
+            return None
+
+        slot_id = self._try_reserve_task(token)
+        while slot_id == None:
+            time.sleep(self._wait_interval)
+            slot_id = self._try_reserve_task(token)
+        return slot_id
+
+
+    async def reserve_task_async(self, token:str):
+        """
+        非阻塞版本的reserve_task
+        """
+        if self._max_in_flight == None:
+            return None
+
+        slot_id = self._try_reserve_task(token)
+        while slot_id == None:
+            await asyncio.sleep(self._wait_interval)
+            slot_id = self._try_reserve_task(token)
+        return slot_id
+
+
+    def bind_task(self, token:str, slot_id:str, task_id:str):
+        """
+        任務送出成功後，將名額改為以task_id記錄
+        """
+        if self._max_in_flight == None:
+            return
+
+        with self._state.open() as state:
+            tasks = state['tasks'].setdefault(self._token_key(token), {})
+            if tasks.pop(slot_id, None) != None:
+                tasks[task_id] = self._clock() + self._task_ttl
+
+
+    def release_task(self, token:str, task_id:str):
+        """
+        task_id：任務id或slot_id\n
+        任務結束(或送出失敗)時釋放名額
+        """
+        if self._max_in_flight == None:
+            return
+
+        with self._state.open() as state:
+            state['tasks'].get(self._token_key(token), {}).pop(task_id, None)
+
+
+    def get_in_flight(self, token:str) -> int:
+        """
+        return：token目前合成中的任務數量
+        """
+        with self._state.open() as state:
+            now = self._clock()
+            tasks = state['tasks'].get(self._token_key(token), {})
+            return len([task_id for task_id, expire_time in tasks.items() if expire_time > now])
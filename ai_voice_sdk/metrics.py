@@ -0,0 +1,152 @@
+import threading
+
+
+class MetricsHook(object):
+    """
+    SDK效能數據的hook介面，繼承後覆寫需要的method，並設定Settings.metrics_hook = hook啟用\n
+    enabled = False 時SDK不會量測任何數據，也不會呼叫hook(預設)\n
+    hook可能同時被多個執行緒呼叫，時間單位皆為秒
+    """
+    enabled = False
+
+    def on_request(self, operation:str, status_code:int, connect_time, ttfb:float, total_time:float, size:int):
+        """
+        每個Restful API request結束時呼叫\n
+        operation：["submit", "status", "download"]\n
+        connect_time：建立連線的時間，沿用連線或無法取得時為None\n
+        ttfb：送出request到收到response header的時間\n
+        total_time：送出request到讀完response的時間\n
+        size：response內容大小(bytes)
+        """
+        pass
+
+
+    def on_retry(self, delay:float):
+        """
+        伺服器忙碌，等待delay後重送任務時呼叫
+        """
+        pass
+
+
+    def on_poll(self, status:str):
+        """
+        每次查詢任務狀態後呼叫，status為查詢到的任務狀態
+        """
+        pass
+
+
+    def on_download(self, size:int, elapsed:float):
+        """
+        每個音檔下載完成時呼叫，size為音檔大小(bytes)
+        """
+        pass
+
+
+    def on_queue_wait(self, wait_time:float):
+        """
+        任務或下載從排入執行緒池(或等待同時執行數量限制)到開始執行時呼叫
+        """
+        pass
+
+
+    def on_chunking(self, source:str, cpu_time:float, paragraph_count:int):
+        """
+        TextEditor分段完成時呼叫\n
+        source：["text", "ssml", "file"]\n
+        cpu_time：分段使用的CPU時間(目前執行緒)
+        """
+        pass
+
+
+class InMemoryMetrics(MetricsHook):
+    """
+    將所有數據彙總在記憶體的MetricsHook，可由get_stats取得後輸出到監控系統\n
+    counters：{name: 累計值}\n
+    timings：{name: {"count", "sum", "min", "max", "avg"}}
+    """
+    enabled = True
+
+    _counters:dict
+    _timings:dict # {name: [count, sum, min, max]}
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._timings = {}
+
+
+    def _add_count(self, name:str, value = 1):
+        self._counters[name] = self._counters.get(name, 0) + value
+
+
+    def _add_timing(self, name:str, value:float):
+        timing = self._timings.get(name)
+        if timing == None:
+            self._timings[name] = [1, value, value, value]
+        else:
+            timing[0] += 1
+            timing[1] += value
+            timing[2] = min(timing[2], value)
+            timing[3] = max(timing[3], value)
+
+
+    def on_request(self, operation:str, status_code:int, connect_time, ttfb:float, total_time:float, size:int):
+        with self._lock:
+            self._add_count(f"request.{operation}.count")
+            self._add_count(f"request.{operation}.bytes", size)
+            if status_code != 200:
+                self._add_count(f"request.{operation}.error")
+            if connect_time != None:
+                self._add_timing(f"request.{operation}.connect", connect_time)
+            self._add_timing(f"request.{operation}.ttfb", ttfb)
+            self._add_timing(f"request.{operation}.total", total_time)
+
+
+    def on_retry(self, delay:float):
+        with self._lock:
+            self._add_count("task.retry")
+            self._add_timing("task.retry_delay", delay)
+
+
+    def on_poll(self, status:str):
+        with self._lock:
+            self._add_count("task.poll")
+            self._add_count(f"task.poll.{status.lower()}")
+
+
+    def on_download(self, size:int, elapsed:float):
+        with self._lock:
+            self._add_count("download.count")
+            self._add_count("download.bytes", size)
+            self._add_timing("download.time", elapsed)
+
+
+    def on_queue_wait(self, wait_time:float):
+        with self._lock:
+            self._add_timing("task.queue_wait", wait_time)
+
+
+    def on_chunking(self, source:str, cpu_time:float, paragraph_count:int):
+        with self._lock:
+            self._add_count(f"chunking.{source}.paragraphs", paragraph_count)
+            self._add_timing(f"chunking.{source}.cpu", cpu_time)
+
+
+    def get_stats(self) -> dict:
+        """
+        return：{"counters": {name: value}, "timings": {name: {"count", "sum", "min", "max", "avg"}}}
+        """
+        with self._lock:
+            timings = {}
+            for name, (count, total, minimum, maximum) in self._timings.items():
+                timings[name] = {"count": count, "sum": total, "min": minimum, "max": maximum, "avg": total / count}
+            return {"counters": dict(self._counters), "timings": timings}
+
+
+    def reset(self):
+        """
+        清除所有數據
+        """
+        with self._lock:
+            self._counters.clear()
+            self._timings.clear()
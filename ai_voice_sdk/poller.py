@@ -0,0 +1,212 @@
+import copy
+import heapq
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+
+from .config import ConverterConfig, PollingPolicy, Settings
+from .units import RestfulApiHandler
+from .limiter import RateLimiter
+from .breaker import CircuitBreaker
+
+class StatusPoller(object):
+    """
+    多個VoiceConverter共用的任務狀態查詢服務\n
+    所有任務由同一個排程執行緒依polling_policy安排查詢時間，並共用同一個連線池送出request\n
+    pool_size：連線池大小，同時也是同時送出查詢的最大數量\n
+    policy：查詢任務狀態的等待策略，未指定時使用PollingPolicy預設值\n
+    limiter：RateLimiter，限制查詢任務狀態的速率，None=不限制\n
+    circuit_breaker：CircuitBreaker，斷路器開啟時暫停查詢，None=不使用
+    """
+    _policy:PollingPolicy
+    _session:requests.Session
+    _handlers:dict # {(server_url, endpoint pool id, token): RestfulApiHandler}
+    _schedule_list:list # heap [(due_time, sequence, entry)]
+
+    def __init__(self, pool_size = Settings.pool_size, policy = None, limiter = None, circuit_breaker = None) -> None:
+        if type(pool_size) != int:
+            raise TypeError("Parameter 'pool_size(int)' type error.")
+        if pool_size < 1:
+            raise ValueError("Parameter 'pool_size(int)' value error.")
+        if (policy != None) and (type(policy) != PollingPolicy):
+            raise TypeError("Parameter 'policy(PollingPolicy)' type error.")
+        if (limiter != None) and (type(limiter) != RateLimiter):
+            raise TypeError("Parameter 'limiter(RateLimiter)' type error.")
+        if (circuit_breaker != None) and (type(circuit_breaker) != CircuitBreaker):
+            raise TypeError("Parameter 'circuit_breaker(CircuitBreaker)' type error.")
+
+        self._limiter = limiter
+        self._circuit_breaker = circuit_breaker
+        self._policy = policy if policy != None else PollingPolicy()
+        self._session = requests.Session()
+        # 共用的設定檔可能使用不同的伺服器，每個伺服器各自保留連線(pool_connections使用預設值)
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size)
+
+        self._handlers = {}
+        self._schedule_list = []
+        self._sequence = 0
+        self._condition = threading.Condition()
+        self._is_closed = False
+        self._thread = None
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def _get_handler(self, config:ConverterConfig) -> RestfulApiHandler:
+        # 使用多個endpoint時，需由同一個pool查詢任務所屬的endpoint
+        key = (config.get_server(), id(config.get_endpoint_pool()), config.get_token())
+        if key not in self._handlers:
+            self._handlers[key] = RestfulApiHandler(copy.deepcopy(config), self._session, self._limiter, self._circuit_breaker)
+        return self._handlers[key]
+
+
+    def _start(self):
+        if self._thread == None:
+            self._thread = threading.Thread(target=self._schedule_loop, name="ai-voice-status-poller", daemon=True)
+            self._thread.start()
+
+
+    def _set_result(self, future:Future, result_json:dict):
+        # 使用者可能已取消等待
+        if not future.cancelled():
+            future.set_result(result_json)
+
+
+    def _set_exception(self, future:Future, error:Exception):
+        if not future.cancelled():
+            future.set_exception(error)
+
+
+    def _schedule(self, entry:dict):
+        # 呼叫前需持有self._condition
+        delay = next(entry['delays'], None)
+        if delay == None:
+            self._set_result(entry['future'], {"data": {"status": "RUNNING"}, "code": 40899})
+            return
+
+        self._sequence += 1
+        heapq.heappush(self._schedule_list, (time.monotonic() + delay, self._sequence, entry))
+        self._condition.notify()
+
+
+    def _schedule_loop(self):
+        while True:
+            with self._condition:
+                while not self._is_closed:
+                    if len(self._schedule_list) == 0:
+                        self._condition.wait()
+                        continue
+
+                    wait_time = self._schedule_list[0][0] - time.monotonic()
+                    if wait_time <= 0:
+                        break
+                    self._condition.wait(wait_time)
+
+                if self._is_closed:
+                    return
+
+                now = time.monotonic()
+                due_entries = []
+                while (len(self._schedule_list) > 0) and (self._schedule_list[0][0] <= now):
+                    due_entries.append(heapq.heappop(self._schedule_list)[2])
+
+            for entry in due_entries:
+                self._executor.submit(self._check_status, entry)
+
+
+    def _check_status(self, entry:dict):
+        future = entry['future']
+        if future.cancelled():
+            return
+
+        try:
+            result_json = entry['handler'].get_task_status(entry['task_id'])
+            # 404或非JSON的5xx回應，data為錯誤訊息字串
+            status = result_json['data'].get('status') if type(result_json['data']) == dict else None
+        except Exception as error:
+            self._set_exception(future, error)
+            return
+
+        if Settings.metrics_hook.enabled and (status != None):
+            Settings.metrics_hook.on_poll(status)
+
+        if status != "RUNNING":
+            self._set_result(future, result_json)
+            return
+
+        with self._condition:
+            if self._is_closed:
+                future.cancel()
+            else:
+                self._schedule(entry)
+
+
+    def watch(self, config:ConverterConfig, task_id:str, text_length = 0, callback = None) -> Future:
+        """
+        config：任務所屬轉換器的設定檔(server與token)\n
+        task_id：要查詢的任務\n
+        text_length：任務文字長度，用於估計第一次查詢的時間\n
+        callback：任務結束時呼叫的function，參數為Future\n
+        return：任務結束時完成的Future，結果為最後一次get_task_status的回傳值
+        """
+        if type(config) != ConverterConfig:
+            raise TypeError("Parameter 'config(ConverterConfig)' type error.")
+
+        future = Future()
+        if callback != None:
+            future.add_done_callback(callback)
+
+        with self._condition:
+            if self._is_closed:
+                raise RuntimeError("Status poller is closed.")
+
+            entry = {
+                "handler": self._get_handler(config),
+                "task_id": task_id,
+                "future": future,
+                "delays": self._policy.delays(text_length)
+            }
+            self._schedule(entry)
+            self._start()
+
+        return future
+
+
+    def get_pending_count(self) -> int:
+        """
+        return：等待查詢的任務數量
+        """
+        with self._condition:
+            return len(self._schedule_list)
+
+
+    def close(self):
+        """
+        停止排程執行緒並關閉連線池，尚未結束的任務會被取消
+        """
+        with self._condition:
+            if self._is_closed:
+                return
+            self._is_closed = True
+            pending_entries = [item[2] for item in self._schedule_list]
+            self._schedule_list.clear()
+            self._condition.notify_all()
+
+        for entry in pending_entries:
+            entry['future'].cancel()
+
+        if self._thread != None:
+            self._thread.join()
+        self._executor.shutdown(wait=True)
+        self._session.close()
@@ -1,7 +1,10 @@
 # -*- coding:utf-8 -*-
 
 import re
+import time
 import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from itertools import accumulate
 from typing import Callable
 
 from .config import Settings
@@ -23,13 +26,27 @@ class TextParagraph(object):
 
 
 class TextEditor(object):
-    text = []
+    """
+    文章編輯器，text為此實例專用的段落清單(由VoiceConverter建立時與轉換器共用)，同一個實例不可同時被多個執行緒呼叫
+    """
+    text:list
     __text_limit = Settings.text_limit
     __elastic_value = Settings.elastic_value
     _support_file_type = Settings.support_file_type
 
     __notice_value_update: Callable[[dict], None] = None
 
+    __punctuation = ['。', '！', '!', '？', '?', '\n', '\t', '，', ',', '、', '　', ' ', '（', '）', '(', ')', '「', '」', '；', '﹔']
+    __punctuation_pattern = re.compile("[" + re.escape("".join(__punctuation)) + "]")
+    __reserved_word_pattern = re.compile(r'["&\'<>]')
+    # 分割第一段時的最小單位：tag、已跳脫的保留字或單一字元
+    __split_token_pattern = re.compile(r'<[^>]*>|&[^;&<]*;|.', re.S)
+    __tag_name_pattern = re.compile(r'<\s*/?\s*([\w:-]+)')
+    __reserved_word_table = {'"': "&quot;", '&': "&amp;", "'": "&apos;", '<': "&lt;", '>': "&gt;"}
+    # 跳脫後增加的長度，與每個字跳脫後的最大長度
+    __reserved_word_extra_length = {word: len(escaped) - 1 for word, escaped in __reserved_word_table.items()}
+    __max_escaped_length = max(len(escaped) for escaped in __reserved_word_table.values())
+
     def __init__(self, text:list, callback = None) -> None:
         self.text = text
 
@@ -37,75 +54,149 @@ class TextEditor(object):
             self.__notice_value_update = callback
 
 
-    def __check_reserved_word(self, text:str) -> str:
-        if '"' in text:
-            # print("[DEBUG] Find reserved_word " + '"')
-            text = text.replace('"', "&quot;")
-        if '&' in text:
-            # print("[DEBUG] Find reserved_word " + '&')
-            text = text.replace('&', "&amp;")
-        if "'" in text:
-            # print("[DEBUG] Find reserved_word " + "'")
-            text = text.replace("'", "&apos;")
-        if '<' in text:
-            # print("[DEBUG] Find reserved_word " + '<')
-            text = text.replace('<', "&lt;")
-        if '>' in text:
-            # print("[DEBUG] Find reserved_word " + '>')
-            text = text.replace('>', "&gt;")
-        return text
-
-
-    def __count_reserved_word(self, text:str) -> int:
-        count = 0
-        reserved_word_list = [r'"', r'&', r"'", r'<', r'>']
-        for key_word in reserved_word_list:
-            count += len(re.findall(key_word, text))
-
-        return count*6
+    def __escape_reserved_word(self, text:str) -> str:
+        """
+        一次跳脫所有SSML保留字(不會重複跳脫'&')
+        """
+        table = self.__reserved_word_table
+        return self.__reserved_word_pattern.sub(lambda match: table[match.group()], text)
 
 
-    def __check_text_length(self, text:str) -> list:
+    def __find_split_positions(self, text:str) -> list:
         """
-        檢查傳入的文字有沒有超出限制，如果超出限制會以標點符號分割字串
+        找出文字跳脫保留字後不超出限制的分割位置，優先以標點符號分割\n
+        return：依序排列的分割位置(不含開頭與結尾)，最後一段的長度不超過限制
         """
         limit = self.__text_limit
         result = []
         text_length = len(text)
         merge_start_position = 0
-        split_position = limit
-        punctuation = ['。', '！', '!', '？', '?', '\n', '\t', '，', ',', '、', '　', ' ', '（', '）', '(', ')', '「', '」', '；', '﹔']
-
-        reserved_lenth = 0
-        while(split_position < text_length):
-            reserved_lenth = self.__count_reserved_word(text[merge_start_position:split_position])
-            if reserved_lenth >= limit:
-                raise ValueError("Use too much reserved word.")
-
-            split_position -= reserved_lenth
-            # 從分割點開始向前尋找標點符號
-            for i in range(split_position-1, merge_start_position, -1):
-                if text[i] in punctuation:
-                    split_position = i
-                    break
 
-            # 分段儲存文字
-            # result.append(text[merge_start_position:split_position])
-            result.append(TextParagraph(text[merge_start_position:split_position]))
+        # 每個字跳脫後最長為__max_escaped_length個字，不可能超出限制時不需分割(SSML中大部分的tag)
+        if text_length * self.__max_escaped_length <= limit:
+            return result
+
+        # 預先找出所有標點符號與保留字的位置，每次分割只需二分搜尋，不需重新掃描文字
+        punctuation_positions = [match.start() for match in self.__punctuation_pattern.finditer(text)]
+        reserved_positions = [match.start() for match in self.__reserved_word_pattern.finditer(text)]
+        # reserved_extra_length[i]：前i個保留字跳脫後增加的長度總和
+        reserved_extra_length = [0] + list(accumulate(self.__reserved_word_extra_length[text[position]] \
+                                                      for position in reserved_positions))
+
+        def escaped_length(start:int, end:int) -> int:
+            # text[start:end]跳脫保留字後的實際長度
+            return end - start + reserved_extra_length[bisect_left(reserved_positions, end)] \
+                               - reserved_extra_length[bisect_left(reserved_positions, start)]
+
+        while escaped_length(merge_start_position, text_length) > limit:
+            # 二分搜尋跳脫後長度不超過limit的最遠分割點
+            low = merge_start_position + 1
+            high = min(merge_start_position + limit, text_length)
+            while low < high:
+                middle = (low + high + 1) // 2
+                if escaped_length(merge_start_position, middle) <= limit:
+                    low = middle
+                else:
+                    high = middle - 1
+            split_position = low
+
+            # 從分割點開始向前尋找標點符號(不含分段起點)
+            index = bisect_left(punctuation_positions, split_position) - 1
+            if (index >= 0) and (punctuation_positions[index] > merge_start_position):
+                split_position = punctuation_positions[index]
+
+            result.append(split_position)
             # 實際分割點(標點符號位置)設為新分割點
             merge_start_position = split_position
 
-            split_position += limit
+        return result
 
-        # result.append(text[merge_start_position:])
-        if self.__count_reserved_word(text[merge_start_position:]) > self.__elastic_value: # elastic_value = 200
-            raise ValueError("Use too much reserved word.")
 
-        result.append(TextParagraph(text[merge_start_position:]))
+    def __check_text_length(self, text:str) -> list:
+        """
+        檢查傳入的文字跳脫保留字後有沒有超出限制，如果超出限制會以標點符號分割字串\n
+        return：已跳脫保留字的TextParagraph
+        """
+        metrics = Settings.metrics_hook
+        cpu_start_time = time.thread_time() if metrics.enabled else 0
 
+        result = []
+        merge_start_position = 0
+        for split_position in self.__find_split_positions(text):
+            # 分段儲存文字
+            result.append(TextParagraph(self.__escape_reserved_word(text[merge_start_position:split_position])))
+            merge_start_position = split_position
+
+        result.append(TextParagraph(self.__escape_reserved_word(text[merge_start_position:])))
+
+        if metrics.enabled:
+            metrics.on_chunking("text", time.thread_time() - cpu_start_time, len(result))
         return result
 
 
+    def __find_first_split(self, text:str, limit:int) -> tuple:
+        """
+        找出第一段不超過limit的分割位置，優先在最後一個標點符號之後分割，沒有標點符號時直接在limit前分割\n
+        不會分割tag、已跳脫的保留字與<phoneme>，在<prosody>內分割時，第一段補上結尾tag、第二段補上開頭tag\n
+        return：(第一段, 第二段)，無法分割時回傳None
+        """
+        open_tags = [] # [(tag名稱, 開頭tag)]
+        punctuation_split = None
+        last_split = None
+        for match in self.__split_token_pattern.finditer(text):
+            token = match.group()
+            if token[0] == '<':
+                name = self.__tag_name_pattern.match(token)
+                name = "" if name == None else name.group(1)
+                if token[1:].lstrip().startswith('/'):
+                    if (len(open_tags) > 0) and (open_tags[-1][0] == name):
+                        open_tags.pop()
+                elif not token.endswith('/>'):
+                    open_tags.append((name, token))
+
+            position = match.end()
+            if position >= len(text):
+                break
+            if any(name != "prosody" for name, _ in open_tags):
+                continue
+
+            end_text = "".join(f"</{name}>" for name, _ in reversed(open_tags))
+            if position + len(end_text) > limit:
+                break
+            split = (position, end_text, "".join(start_text for _, start_text in open_tags))
+            last_split = split
+            if token in self.__punctuation:
+                punctuation_split = split
+
+        split = punctuation_split if punctuation_split != None else last_split
+        if split == None:
+            return None
+        position, end_text, start_text = split
+        return (text[:position] + end_text, start_text + text[position:])
+
+
+    def _split_first_paragraph(self, paragraphs, limit:int):
+        """
+        paragraphs：依序排列的TextParagraph\n
+        limit：第一段的長度上限\n
+        將第一段在不超過limit的位置分開(優先在標點符號之後，含SSML tag的段落在tag之間分割)，其餘段落不變
+        """
+        paragraphs = iter(paragraphs)
+        for paragraph in paragraphs:
+            split_text = None
+            if paragraph._length > limit:
+                split_text = self.__find_first_split(paragraph._text, limit)
+
+            if split_text != None:
+                yield TextParagraph(split_text[0])
+                yield TextParagraph(split_text[1])
+            else:
+                yield paragraph
+            break
+
+        yield from paragraphs
+
+
     def _add_phoneme(self, text:str, ph:str):
         """
         text：加入的文字\n
@@ -202,127 +293,175 @@ class TextEditor(object):
         return f'<prosody{tag_rate}{tag_pitch}{tag_volume}>{text}</prosody>'
 
 
-    def _get_ssml_all_tags(self, element:ET.Element, layer = 1) -> list:
+    def _iter_ssml_tags(self, ssml_blocks):
         """
-        element: 套件解析後的element tree\n
-        layer: 第幾層的節點(default layer = 1)
+        ssml_blocks：SSML文字，可分段傳入(例如逐段讀取的檔案)\n
+        以事件驅動的方式逐段解析SSML，依文件順序回傳每個tag的資訊\n
+        {"layer": 第幾層的節點, "tag": tag名稱, "attrib": tag屬性, "text": tag內的文字}，tag的tail以tag = "tail"回傳
         """
-        ssml_tags:list = [] # [layer, tag, attrib, text]
-        tag:str = element.tag[element.tag.rfind('}')+1:]
-        text:str = ""
+        parser = ET.XMLPullParser(events=("start", "end"))
+        stack = [] # 尚未結束的element
+        pending = None # (event, element, layer)，element的text/tail在解析到下一個事件後才會完整
 
-        if element.text:
-            text = element.text
+        try:
+            for block in ssml_blocks:
+                parser.feed(block)
+                for event, element in parser.read_events():
+                    if pending != None:
+                        pending_record = self.__pending_ssml_record(pending, stack)
+                        if pending_record != None:
+                            yield pending_record
+
+                    if event == "start":
+                        stack.append(element)
+                        pending = (event, element, len(stack))
+                    else:
+                        stack.pop()
+                        pending = (event, element, len(stack))
+            parser.close()
+        except ET.ParseError as error:
+            raise ValueError(f"Ssml string {error}")
 
-        # Add ssml tag to list
-        ssml_tags.append({"layer": layer, "tag": tag, "attrib": element.attrib, "text": text})
+        # 最後一個事件為根節點結束，根節點的tail不需要處理
+        for _ in parser.read_events():
+            pass
 
-        for child in element:
-            ssml_tags += self._get_ssml_all_tags(child, layer+1)
-            if child.tail:
-                ssml_tags.append({"layer": layer, "tag": "tail", "attrib": None, "text": child.tail})
 
-        return ssml_tags
+    def __pending_ssml_record(self, pending:tuple, stack:list) -> dict:
+        event, element, layer = pending
+        if event == "start":
+            tag = element.tag[element.tag.rfind('}')+1:]
+            text = element.text if element.text else ""
+            return {"layer": layer, "tag": tag, "attrib": dict(element.attrib), "text": text}
 
+        # 子節點已處理完畢，從父節點移除以釋放記憶體
+        tail = element.tail
+        if len(stack) > 0:
+            stack[-1].remove(element)
+        if tail:
+            return {"layer": layer, "tag": "tail", "attrib": None, "text": tail}
+        return None
 
 
-    def _ssml_tag_to_text(self, ssml_tag:dict) -> str:
+    def _ssml_tag_template(self, ssml_tag:dict) -> tuple:
+        """
+        解析tag屬性並產生SSML文字的樣板，同一個tag分割後的每段文字可共用\n
+        return：(開頭, 結尾, 是否包含tag內的文字)，SSML文字 = 開頭 + text + 結尾
+        """
         if ssml_tag['tag'] == "voice":
-            return ssml_tag['text']
+            return ("", "", True)
         elif ssml_tag['tag'] == "phoneme":
-            return self._add_phoneme(ssml_tag['text'], ssml_tag['attrib']['ph'])
+            ssml_text = self._add_phoneme("", ssml_tag['attrib']['ph'])
+            return (ssml_text[:-len("</phoneme>")], "</phoneme>", True)
         elif ssml_tag['tag'] == "break":
-            return self._add_break(int(ssml_tag['attrib']['time'][:-2]))
+            return (self._add_break(int(ssml_tag['attrib']['time'][:-2])), "", False)
         elif ssml_tag['tag'] == "prosody":
-            return self._add_prosody(ssml_tag['text'], float(ssml_tag['attrib']['rate']), \
-                                     int(ssml_tag['attrib']['pitch'][:-2]), float(ssml_tag['attrib']['volume'][:-2]))
+            ssml_text = self._add_prosody("", float(ssml_tag['attrib']['rate']), \
+                                          int(ssml_tag['attrib']['pitch'][:-2]), float(ssml_tag['attrib']['volume'][:-2]))
+            return (ssml_text[:-len("</prosody>")], "</prosody>", True)
         elif ssml_tag['tag'] == "tail":
-            return ssml_tag['text']
+            return ("", "", True)
         else:
-            return ""
-
+            return ("", "", False)
 
-    def _format_ssml_text(self, ssml_element:ET.Element) -> list:
-        limit = self.__text_limit
 
-        ssml_tag_list = self._get_ssml_all_tags(ssml_element, 1)
-        text_list = [""]
+    def _ssml_tag_to_text(self, ssml_tag:dict) -> str:
+        start_text, end_text, is_with_text = self._ssml_tag_template(ssml_tag)
+        if is_with_text:
+            return start_text + ssml_tag['text'] + end_text
+        return start_text + end_text
 
-        count = 0
-        length = 0
-        i = 0
-        is_prosody = False
-        prosody_layer = 1
-        prosody_tag_info = ""
 
-        ssml_tag_list_after_check_length = []
-        for tag in ssml_tag_list:
+    def _iter_checked_ssml_tags(self, ssml_tags):
+        """
+        檢查每個tag的文字長度與保留字，超出限制的tag會分割成多段，並產生每段的SSML文字\n
+        {"layer": 第幾層的節點, "tag": tag名稱, "start_text": tag開頭, "ssml_text": SSML文字, "length": SSML文字長度}
+        """
+        for tag in ssml_tags:
             # check is get voice tag and call converter to update config info as the same time
             if tag['tag'] == "voice":
                 if self.__notice_value_update != None:
                     self.__notice_value_update({"config_voice": tag['attrib']['name']})
 
-            # 檢查文字長度，同時檢查保留字，並存為新的text list
-            text_paragraph_list = self.__check_text_length(tag['text'])
+            # 每個tag只解析一次屬性
+            start_text, end_text, is_with_text = self._ssml_tag_template(tag)
+            for text in self.__check_text_length(tag['text']):
+                if is_with_text:
+                    ssml_text = start_text + text._text + end_text
+                else:
+                    ssml_text = start_text + end_text
+                yield {"layer": tag['layer'], "tag": tag['tag'], "start_text": start_text, \
+                       "ssml_text": ssml_text, "length": len(ssml_text)}
+
+
+    def _format_ssml_text(self, ssml_tags):
+        """
+        ssml_tags：_iter_ssml_tags回傳的tag資訊\n
+        依長度限制將SSML tag組合成多段文字，逐段回傳，每段SSML文字只產生一次
+        """
+        limit = self.__text_limit
+        prosody_end_tag = "</prosody>"
+
+        checked_tags = self._iter_checked_ssml_tags(ssml_tags)
+        current_tag = next(checked_tags)
+        text = ""
 
-            for text in text_paragraph_list:
-                ssml_tag_list_after_check_length.append({"layer": tag['layer'], "tag": tag['tag'], "attrib":tag['attrib'], \
-                                                          "text": self.__check_reserved_word(text._text)})
+        length = 0
+        is_prosody = False
+        prosody_layer = 1
+        prosody_tag_info = ""
 
-        for i in range(len(ssml_tag_list_after_check_length)-1):
-            ssml_text = self._ssml_tag_to_text(ssml_tag_list_after_check_length[i])
+        for next_tag in checked_tags:
+            ssml_text = current_tag['ssml_text']
+            ssml_length = current_tag['length']
 
-            if ssml_tag_list_after_check_length[i]['tag'] == "prosody":
+            if current_tag['tag'] == "prosody":
                 # 偵測到prosody tag，針對prosody情境處裡tag
                 is_prosody = True
 
-                prosody_layer = ssml_tag_list_after_check_length[i]['layer']
-                ssml_text = ssml_text[:ssml_text.rfind("</prosody")] # remove '</prosody>'
-                prosody_tag_info = ssml_text[:ssml_text.find(">")+1]
-                # print("--> start", prosody_start_tag)
+                prosody_layer = current_tag['layer']
+                ssml_text = ssml_text[:-len(prosody_end_tag)] # remove '</prosody>'
+                ssml_length -= len(prosody_end_tag)
+                prosody_tag_info = current_tag['start_text']
 
-            length += len(ssml_text)
-            text_list[count] += ssml_text
+            length += ssml_length
+            text += ssml_text
 
             if is_prosody == True:
-                if ssml_tag_list_after_check_length[i+1]['layer'] <= prosody_layer:
-                    if (ssml_tag_list_after_check_length[i+1]['layer'] == prosody_layer) and (ssml_tag_list_after_check_length[i+1]['tag'] == "tail"):
+                if next_tag['layer'] <= prosody_layer:
+                    if (next_tag['layer'] == prosody_layer) and (next_tag['tag'] == "tail"):
                         pass
                     else:
                         # 偵測prosody tag結尾
                         is_prosody = False
                         prosody_tag_info = ""
-                        # print("--> add end tad </prosody>")
-                        length += len("</prosody>")
-                        text_list[count] += "</prosody>"
+                        length += len(prosody_end_tag)
+                        text += prosody_end_tag
+
+            if length + next_tag['length'] > limit:
+                # Add prosody end tag to previous text
+                if is_prosody == True:
+                    text += prosody_end_tag
+                yield text
 
-            if length + len(self._ssml_tag_to_text(ssml_tag_list_after_check_length[i+1])) > limit:
                 # Add new text element
-                text_list.append("")
-                count += 1
+                text = ""
                 length = 0
-
-                # Add prosody end tag to previous text
                 if is_prosody == True:
-                    text_list[count-1] += "</prosody>"
-                    text_list[count] += prosody_tag_info # Add prosody header tag
+                    text += prosody_tag_info # Add prosody header tag
                 # ========================================
 
-        if len(ssml_tag_list_after_check_length) > 1:
-            i += 1
+            current_tag = next_tag
 
         end_symbol = ""
         if is_prosody == True:
-            end_symbol = "</prosody>"
+            end_symbol = prosody_end_tag
 
-        last_text = self._ssml_tag_to_text(ssml_tag_list_after_check_length[i])
-        if length + len(last_text) > limit:
-            text_list[count] += end_symbol
-            text_list.append((prosody_tag_info + last_text + end_symbol))
+        if length + current_tag['length'] > limit:
+            yield text + end_symbol
+            yield prosody_tag_info + current_tag['ssml_text'] + end_symbol
         else:
-            text_list[count] = text_list[count] + last_text + end_symbol
-
-        return text_list
+            yield text + current_tag['ssml_text'] + end_symbol
 
 
     # ---------- Text ----------
@@ -341,9 +480,6 @@ class TextEditor(object):
         if position == -1:
             position = len(self.text) + 1
 
-        for text_each in text_list:
-            text_each.update(self.__check_reserved_word(text_each._text))
-
         self.text[position:position] = text_list
 
 
@@ -375,8 +511,6 @@ class TextEditor(object):
         limit = self.__text_limit
         count = 0
         for text_each in text_list:
-            text_each.update(self.__check_reserved_word(text_each._text))
-
             tags = [(match.start(), match.end()) for match in re.finditer(r'\[:(.*?)\]', text_each._text)]
             length = len(text_each._text)
             for tag in tags:
@@ -416,26 +550,11 @@ class TextEditor(object):
         self.text[position:position] = text_list
 
 
-    def add_ssml_text(self, text:str, position = -1):
-        """
-        text：加入的文字\n
-        position：文字加入的位置，position = -1 或大於段落總數時會加在最後
-        """
-        if type(position) != int:
-            raise TypeError("Parameter 'position(int)' type error.")
-        if type(text) != str:
-            raise TypeError("Parameter 'text(str)' type error.")
-
-        ssml_element:ET.Element
-        try:
-            ssml_element = ET.fromstring(text)
-        except Exception as error:
-            if type(error) == ET.ParseError:
-                raise ValueError(f"Ssml string {error}")
-            else:
-                raise RuntimeError(f"Read ssml string fail.")
+    def _add_ssml_blocks(self, ssml_blocks, position = -1):
+        metrics = Settings.metrics_hook
+        cpu_start_time = time.thread_time() if metrics.enabled else 0
 
-        ssml_text = self._format_ssml_text(ssml_element)
+        ssml_text = self._format_ssml_text(self._iter_ssml_tags(ssml_blocks))
         text_list = []
 
         if position == -1:
@@ -445,6 +564,23 @@ class TextEditor(object):
             text_list.append(TextParagraph(text))
 
         self.text[position:position] = text_list
+        if metrics.enabled:
+            metrics.on_chunking("ssml", time.thread_time() - cpu_start_time, len(text_list))
+
+
+    def add_ssml_text(self, text:str, position = -1):
+        """
+        text：加入的文字\n
+        position：文字加入的位置，position = -1 或大於段落總數時會加在最後
+        """
+        if type(position) != int:
+            raise TypeError("Parameter 'position(int)' type error.")
+        if type(text) != str:
+            raise TypeError("Parameter 'text(str)' type error.")
+
+        # 分段交給parser解析，每次只需處理一段的element
+        block_size = Settings.read_block_size
+        self._add_ssml_blocks((text[i:i+block_size] for i in range(0, len(text), block_size)), position)
 
 
     def get_text(self) -> list:
@@ -518,7 +654,7 @@ class TextEditor(object):
 
         for text_each in text_list:
             text_each.update(self._add_phoneme(\
-                             self.__check_reserved_word(text_each._text), ph))
+                             text_each._text, ph))
 
         self.text[position:position] = text_list
 
@@ -566,7 +702,7 @@ class TextEditor(object):
 
         for text_each in text_list:
             text_each.update(self._add_prosody(\
-                             self.__check_reserved_word(text_each._text), rate, pitch, volume))
+                             text_each._text, rate, pitch, volume))
 
         self.text[position:position] = text_list
 
@@ -602,7 +738,7 @@ class TextEditor(object):
 
         for text_each in text_list:
             text_each.update(self._add_prosody(self._add_phoneme(\
-                             self.__check_reserved_word(text_each._text), ph), rate, pitch, volume))
+                             text_each._text, ph), rate, pitch, volume))
         self.text[position:position] = text_list
 
 
@@ -619,9 +755,45 @@ class TextEditor(object):
         if extension in self._support_file_type == False:
             raise TypeError(f"Not support '{extension}' type.")
 
-        text = Tools().open_file(file_path, encode)
-
         if extension == ".ssml" or extension == ".xml":
-            self.add_ssml_text(text, position)
+            # 逐段讀取並解析SSML檔案，不需一次讀入整個檔案
+            self._add_ssml_blocks(Tools().iter_file_blocks(file_path, encode), position)
         else:
-            self.add_text(text, position)
+            text_list = list(self.iter_text_file(file_path, encode))
+            if position == -1:
+                position = len(self.text) + 1
+            self.text[position:position] = text_list
+
+
+    def iter_text_file(self, file_path:str, encode = "utf-8"):
+        """
+        file_path：檔案路徑\n
+         encode：檔案編碼格式\n
+        逐段讀取文字檔並依序產生段落，不需一次讀入整個檔案，分段結果與add_text相同\n
+        回傳的段落不會加入文章，可直接交給VoiceConverter.run(paragraphs = ...)邊讀取邊合成
+        """
+        metrics = Settings.metrics_hook
+        cpu_time = 0
+        paragraph_count = 0
+
+        remain_text = ""
+        for block in Tools().iter_file_blocks(file_path, encode):
+            cpu_start_time = time.thread_time() if metrics.enabled else 0
+            # 上一個區塊未分段的文字(不超過一段)與本區塊一起分割
+            text = remain_text + block
+            text_list = []
+            merge_start_position = 0
+            for split_position in self.__find_split_positions(text):
+                text_list.append(TextParagraph(self.__escape_reserved_word(text[merge_start_position:split_position])))
+                merge_start_position = split_position
+            remain_text = text[merge_start_position:]
+
+            if metrics.enabled:
+                # 不計入呼叫端處理段落的時間
+                cpu_time += time.thread_time() - cpu_start_time
+                paragraph_count += len(text_list)
+            yield from text_list
+
+        yield TextParagraph(self.__escape_reserved_word(remain_text))
+        if metrics.enabled:
+            metrics.on_chunking("file", cpu_time, paragraph_count + 1)
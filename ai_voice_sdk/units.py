@@ -1,24 +1,232 @@
 import requests
 import json
-import wave
-import io
+import os
+import time
+import asyncio
+import hashlib
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
 
 from .config import Settings
 from .config import ConverterConfig
 from .enums import Voice
+from .audio import _parse_wav, _check_wav_params, _write_wav
 
 class RestfulApiHandler(object):
     _config:ConverterConfig
 
     _server_support_json_status_code = [200, 400, 500, 503] # 401 server回傳會少帶code參數，所以暫時移除
 
-    def __init__(self, config:ConverterConfig) -> None:
+    _session:requests.Session
+    _is_own_session:bool
+    _limiter = None
+    _circuit_breaker = None
+
+    def __init__(self, config:ConverterConfig, session = None, limiter = None, circuit_breaker = None) -> None:
+        """
+        session：共用的requests.Session，未指定時會依config的連線池設定自行建立\n
+        limiter：RateLimiter，限制送出request的速率與同時合成中的任務數量，None=不限制\n
+        circuit_breaker：CircuitBreaker，伺服器持續忙碌或故障時停止送出request，None=不使用
+        """
         self._config = config
+        self._limiter = limiter
+        self._circuit_breaker = circuit_breaker
+        self._is_own_session = session == None
+        if session == None:
+            session = requests.Session()
+            # 每個伺服器各自保留連線，update_config之後才增加伺服器時也足夠
+            pool_connections = max(requests.adapters.DEFAULT_POOLSIZE, len(self._config.get_servers()))
+            adapter = requests.adapters.HTTPAdapter(pool_connections=pool_connections, pool_maxsize=self._config.get_pool_size())
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self._session = session
+
+
+    def close(self):
+        if self._is_own_session:
+            self._session.close()
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def set_limiter(self, limiter):
+        """
+        limiter：RateLimiter，None=不限制
+        """
+        self._limiter = limiter
+
+
+    def set_circuit_breaker(self, circuit_breaker):
+        """
+        circuit_breaker：CircuitBreaker，None=不使用
+        """
+        self._circuit_breaker = circuit_breaker
+
+
+    def _allow_request(self, server_url:str, operation:str, is_wait = True) -> bool:
+        """
+        is_wait：斷路器設定為排隊等待時，是否等待斷路器恢復\n
+        return：是否可以送出request
+        """
+        if self._circuit_breaker == None:
+            return True
+        if is_wait and self._circuit_breaker.is_wait():
+            self._circuit_breaker.wait(server_url, operation)
+            return True
+        return self._circuit_breaker.allow(server_url, operation)
+
+
+    def is_circuit_open(self, operation:str) -> bool:
+        """
+        return：所有伺服器的斷路器都已開啟，沒有設定斷路器時為False
+        """
+        if self._circuit_breaker == None:
+            return False
+        return all(self._circuit_breaker.get_state(server_url, operation) == "open" for server_url in self._config.get_servers())
+
+
+    def circuit_open_result(self, operation:str) -> json:
+        if operation == "status":
+            # 無法查詢時視為仍在合成中，由呼叫端依polling policy稍後再查詢
+            return {"data": {"status": "RUNNING"}, "code": 50399}
+        return {"data": "Circuit breaker is open, server is busy or unavailable.", "code": 50399}
+
+
+    def _bind_task_slot(self, slot_id:str, result_json):
+        """
+        任務送出成功時以task_id佔用名額，失敗(result_json為None或錯誤)時釋放名額
+        """
+        if slot_id == None:
+            return
+
+        if (result_json != None) and (result_json['code'] == 20001):
+            self._limiter.bind_task(self._config.get_token(), slot_id, result_json['data']['task_id'])
+        else:
+            self._limiter.release_task(self._config.get_token(), slot_id)
+
+
+    def _release_task_slot(self, task_id:str, result_json = None):
+        """
+        result_json：get_task_status的結果，任務已結束或不存在時才釋放名額，None=直接釋放(已下載)
+        """
+        if self._limiter == None:
+            return
+
+        if result_json != None:
+            is_running = (result_json['code'] == 20001) and (result_json['data']['status'] == "RUNNING")
+            if is_running or (result_json['code'] not in [20001, 50303]):
+                return
+        self._limiter.release_task(self._config.get_token(), task_id)
+
+
+    def _select_server(self, exclude_urls = ()) -> str:
+        endpoint_pool = self._config.get_endpoint_pool()
+        return self._config.get_server() if endpoint_pool == None else endpoint_pool.select(exclude_urls)
+
+
+    def _is_last_server(self, tried_urls:list) -> bool:
+        return len(tried_urls) >= len(self._config.get_servers())
+
+
+    def get_task_server(self, task_id:str) -> str:
+        """
+        return：任務所屬的伺服器網址
+        """
+        endpoint_pool = self._config.get_endpoint_pool()
+        return self._config.get_server() if endpoint_pool == None else endpoint_pool.get_task_server(task_id)
+
+
+    def pin_task(self, task_id:str, server_url:str):
+        """
+        指定任務所屬的伺服器(例如接回先前送出的任務)，只使用單一伺服器時不需要
+        """
+        endpoint_pool = self._config.get_endpoint_pool()
+        if (endpoint_pool != None) and (server_url != None):
+            endpoint_pool.pin_task(task_id, server_url)
+
+
+    def _pin_task(self, server_url:str, result_json):
+        if (result_json != None) and (result_json['code'] == 20001):
+            self.pin_task(result_json['data']['task_id'], server_url)
+
+
+    def _finish_task(self, task_id:str, result_json = None):
+        """
+        result_json：get_task_status的結果，None=已下載\n
+        任務結束後不再計入伺服器合成中的任務數量，但保留任務所屬的伺服器，之後查詢狀態或重新下載仍送到同一個伺服器
+        """
+        endpoint_pool = self._config.get_endpoint_pool()
+        if endpoint_pool == None:
+            return
+
+        if (result_json == None) or (result_json['code'] == 50303) or \
+           ((result_json['code'] == 20001) and (result_json['data']['status'] != "RUNNING")):
+            endpoint_pool.finish_task(task_id)
+
+
+    def _on_server_response(self, server_url:str, operation:str, status_code:int, latency:float):
+        endpoint_pool = self._config.get_endpoint_pool()
+        if endpoint_pool != None:
+            endpoint_pool.on_response(server_url, status_code, latency)
+        if self._circuit_breaker != None:
+            # 伺服器忙碌(503)也計入斷路器的失敗次數
+            if status_code >= 500:
+                self._circuit_breaker.on_failure(server_url, operation)
+            else:
+                self._circuit_breaker.on_success(server_url, operation)
+
+
+    def _on_server_failure(self, server_url:str, operation:str):
+        endpoint_pool = self._config.get_endpoint_pool()
+        if endpoint_pool != None:
+            endpoint_pool.on_failure(server_url)
+        if self._circuit_breaker != None:
+            self._circuit_breaker.on_failure(server_url, operation)
 
-    def _restful_sender(self, api_url:str, payload:map) -> requests.models.Response:
-        url = f"{self._config.get_server()}{api_url}"
+
+    def _request_headers(self) -> dict:
         headers = {'content-type': 'application/json', 'Authorization': f'Bearer {self._config.get_token()}'}
-        return requests.post(url, headers=headers, json=payload, timeout=10)
+        if not self._config.is_keep_alive():
+            headers['Connection'] = 'close'
+        return headers
+
+
+    def _restful_sender(self, api_url:str, payload:map, operation = "submit", stream = False, server_url = None) -> requests.models.Response:
+        """
+        operation：["submit", "status", "download"]，依操作類型使用不同的逾時設定\n
+        stream：是否延後讀取response內容，需由呼叫端關閉response\n
+        server_url：送出request的伺服器，None=config的伺服器
+        """
+        if self._limiter != None:
+            self._limiter.acquire(self._config.get_token(), operation)
+
+        server_url = self._config.get_server() if server_url == None else server_url
+        url = f"{server_url}{api_url}"
+        metrics = Settings.metrics_hook
+        if (not metrics.enabled) and (self._config.get_endpoint_pool() == None) and (self._circuit_breaker == None):
+            return self._session.post(url, headers=self._request_headers(), json=payload, timeout=self._config.get_timeout(operation), stream=stream)
+
+        start_time = time.perf_counter()
+        try:
+            result = self._session.post(url, headers=self._request_headers(), json=payload, timeout=self._config.get_timeout(operation), stream=stream)
+        except Exception:
+            self._on_server_failure(server_url, operation)
+            raise
+        self._on_server_response(server_url, operation, result.status_code, result.elapsed.total_seconds())
+        if metrics.enabled and (not stream):
+            # requests無法取得建立連線的時間，elapsed為送出request到解析完response header的時間
+            metrics.on_request(operation, result.status_code, None, result.elapsed.total_seconds(),
+                               time.perf_counter() - start_time, len(result.content))
+        return result
 
 
     def _response_error_handler(self, result:requests.models.Response) -> json:
@@ -51,37 +259,73 @@ class RestfulApiHandler(object):
             return self._response_error_handler(result)
 
 
-    def add_text_task(self, text:str) -> json:
+    def _text_task_payload(self, text:str) -> dict:
         if self._config.voice.value == None:
             raise RuntimeError("Converter voice is 'None'")
 
-        api_url = "/api/v1.0/syn/syn_text"
-        payload = {
+        return {
             "orator_name": self._config.voice.value,
             "text": text
         }
 
+
+    def _ssml_task_payload(self, ssml_text:str) -> dict:
+        if self._config.voice.value == None:
+            raise RuntimeError("Converter voice is 'None'")
+
+        return {
+            "ssml": f'<speak xmlns="http://www.w3.org/2001/10/synthesis" version="{self._config.get_ssml_version()}" xml:lang="{self._config.get_ssml_lang()}">\
+<voice name="{self._config.voice.value}">\
+{ssml_text}\
+</voice></speak>'
+        }
+
+
+    def _send_task(self, api_url:str, payload:map) -> tuple:
+        """
+        送出任務，使用多個endpoint時，無法連線或斷路器開啟的endpoint改送到其他endpoint\n
+        return：(server_url, response)，所有endpoint的斷路器都開啟時response為None
+        """
+        tried_urls = []
+        while True:
+            server_url = self._select_server(tried_urls)
+            tried_urls.append(server_url)
+            is_last_server = self._is_last_server(tried_urls)
+            # 還有其他endpoint時不等待斷路器恢復
+            if not self._allow_request(server_url, "submit", is_last_server):
+                if is_last_server:
+                    return (server_url, None)
+                continue
+            try:
+                return (server_url, self._restful_sender(api_url, payload, server_url=server_url))
+            except requests.exceptions.ConnectionError:
+                if is_last_server:
+                    raise
+
+
+    def add_text_task(self, text:str) -> json:
+        api_url = "/api/v1.0/syn/syn_text"
+        payload = self._text_task_payload(text)
+
         if len(payload['text']) > 2000:
             return {"data": "字數超過限制值", "code": 40010}
 
+        slot_id = None if self._limiter == None else self._limiter.reserve_task(self._config.get_token())
+        result_json = None
         try:
-            result = self._restful_sender(api_url, payload)
-            return self._response_handler(result)
+            server_url, result = self._send_task(api_url, payload)
+            result_json = self.circuit_open_result("submit") if result == None else self._response_handler(result)
+            self._pin_task(server_url, result_json)
+            return result_json
         except Exception as error:
             raise Exception(f"An unexpected error occurred: {error}")
+        finally:
+            self._bind_task_slot(slot_id, result_json)
 
 
     def add_ssml_task(self, ssml_text:str) -> json:
-        if self._config.voice.value == None:
-            raise RuntimeError("Converter voice is 'None'")
-
         api_url = "/api/v1.0/syn/syn_ssml"
-        payload = {
-            "ssml": f'<speak xmlns="http://www.w3.org/2001/10/synthesis" version="{self._config.get_ssml_version()}" xml:lang="{self._config.get_ssml_lang()}">\
-<voice name="{self._config.voice.value}">\
-{ssml_text}\
-</voice></speak>'
-        }
+        payload = self._ssml_task_payload(ssml_text)
 
         # ssml default length = 191
         # print(f"payload length(ssml): {len(payload['ssml'])}, content length: {len(ssml_text)}")
@@ -90,11 +334,17 @@ class RestfulApiHandler(object):
 
         # print(f"ssml payload: {payload.get('ssml')}")
 
+        slot_id = None if self._limiter == None else self._limiter.reserve_task(self._config.get_token())
+        result_json = None
         try:
-            result = self._restful_sender(api_url, payload)
-            return self._response_handler(result)
+            server_url, result = self._send_task(api_url, payload)
+            result_json = self.circuit_open_result("submit") if result == None else self._response_handler(result)
+            self._pin_task(server_url, result_json)
+            return result_json
         except Exception as error:
             raise Exception(f"An unexpected error occurred: {error}")
+        finally:
+            self._bind_task_slot(slot_id, result_json)
 
 
     def get_task_status(self, task_id:str) -> json:
@@ -103,12 +353,20 @@ class RestfulApiHandler(object):
             "task_id": task_id
         }
 
+        server_url = self.get_task_server(task_id)
+        if not self._allow_request(server_url, "status"):
+            return self.circuit_open_result("status")
+
         try:
-            result = self._restful_sender(api_url, payload)
-            return self._response_handler(result)
+            result = self._restful_sender(api_url, payload, "status", server_url=server_url)
+            result_json = self._response_handler(result)
         except Exception as error:
             raise Exception(f"An unexpected error occurred: {error}")
 
+        self._release_task_slot(task_id, result_json)
+        self._finish_task(task_id, result_json)
+        return result_json
+
 
     def get_task_audio(self, task_id:str) -> json:
         api_url = "/api/v1.0/syn/get_file"
@@ -116,9 +374,18 @@ class RestfulApiHandler(object):
             "filename": f"{task_id}.wav"
         }
 
+        server_url = self.get_task_server(task_id)
+        if not self._allow_request(server_url, "download"):
+            return self.circuit_open_result("download")
+
         try:
-            result = self._restful_sender(api_url, payload)
+            start_time = time.perf_counter()
+            result = self._restful_sender(api_url, payload, "download", server_url=server_url)
             if result.headers['Content-Type'] == "audio/wav":
+                if Settings.metrics_hook.enabled:
+                    Settings.metrics_hook.on_download(len(result.content), time.perf_counter() - start_time)
+                self._release_task_slot(task_id)
+                self._finish_task(task_id)
                 return {"data": result.content, "code": 20001}
             else:
                 return self._response_handler(result)
@@ -126,14 +393,411 @@ class RestfulApiHandler(object):
             raise Exception(f"An unexpected error occurred: {error}")
 
 
+    def download_task_audio(self, task_id:str, sink, block_size = Settings.read_block_size, expected_size = None, checksum = None) -> json:
+        """
+        task_id：任務id\n
+        sink：檔案名稱(不含副檔名)，或可寫入的binary stream(例如socket.makefile('wb'))\n
+        block_size：每次寫入的bytes數\n
+        expected_size：音檔大小(bytes)，未指定時使用response的Content-Length檢查\n
+        checksum：音檔的sha256(hex)，指定時檢查下載內容\n
+        逐段將音檔寫入sink，不會將整個音檔留在記憶體\n
+        return：成功時data為{"size": 音檔大小, "sha256": 音檔sha256}
+        """
+        api_url = "/api/v1.0/syn/get_file"
+        payload = {
+            "filename": f"{task_id}.wav"
+        }
+
+        server_url = self.get_task_server(task_id)
+        if not self._allow_request(server_url, "download"):
+            return self.circuit_open_result("download")
+
+        try:
+            start_time = time.perf_counter()
+            with self._restful_sender(api_url, payload, "download", stream=True, server_url=server_url) as result:
+                metrics = Settings.metrics_hook
+                if result.headers['Content-Type'] != "audio/wav":
+                    if metrics.enabled:
+                        metrics.on_request("download", result.status_code, None, result.elapsed.total_seconds(),
+                                           time.perf_counter() - start_time, len(result.content))
+                    return self._response_handler(result)
+
+                audio_sink = _AudioSink(sink, _get_expected_size(result.headers, expected_size), checksum)
+                try:
+                    for block in result.iter_content(block_size):
+                        audio_sink.write(block)
+                except Exception:
+                    audio_sink.abort()
+                    raise
+
+                if metrics.enabled:
+                    total_time = time.perf_counter() - start_time
+                    metrics.on_request("download", result.status_code, None, result.elapsed.total_seconds(), total_time, audio_sink.size)
+                    metrics.on_download(audio_sink.size, total_time)
+                self._release_task_slot(task_id)
+                self._finish_task(task_id)
+                return audio_sink.close()
+        except Exception as error:
+            raise Exception(f"An unexpected error occurred: {error}")
+
+
+def _get_expected_size(headers, expected_size):
+    # 有壓縮時Content-Length為壓縮後的大小，不能用來檢查
+    if (expected_size == None) and ('Content-Length' in headers) and ('Content-Encoding' not in headers):
+        return int(headers['Content-Length'])
+    return expected_size
+
+
+class _AudioSink(object):
+    """
+    將下載的音檔逐段寫入檔案或stream，並計算大小與sha256\n
+    寫入檔案時先寫到暫存檔，檢查通過後才取代目標檔案
+    """
+    size:int
+
+    def __init__(self, sink, expected_size = None, checksum = None) -> None:
+        self.size = 0
+        self._expected_size = expected_size
+        self._checksum = checksum
+        self._hash = hashlib.sha256()
+        self._is_stream = hasattr(sink, "write")
+        if self._is_stream:
+            self._output = sink
+        else:
+            self._path = f"{sink}.wav"
+            self._temp_path = f"{self._path}.{os.getpid()}.tmp"
+            self._output = open(self._temp_path, 'wb')
+
+
+    def write(self, block:bytes):
+        self._output.write(block)
+        self._hash.update(block)
+        self.size += len(block)
+
+
+    def abort(self):
+        if not self._is_stream:
+            self._output.close()
+            os.remove(self._temp_path)
+
+
+    def close(self) -> json:
+        sha256 = self._hash.hexdigest()
+        is_valid = ((self._expected_size == None) or (self.size == self._expected_size)) and \
+                   ((self._checksum == None) or (self._checksum.lower() == sha256))
+
+        if not self._is_stream:
+            self._output.close()
+            if is_valid:
+                os.replace(self._temp_path, self._path)
+            else:
+                os.remove(self._temp_path)
+
+        if not is_valid:
+            return {"data": f"Downloaded audio mismatch, size: {self.size}, sha256: {sha256}", "code": 42299}
+        return {"data": {"size": self.size, "sha256": sha256}, "code": 20001}
+
+
+class _AsyncResponse(object):
+    """
+    將aiohttp的response整理成與requests相同的介面，讓RestfulApiHandler的response處理可以共用
+    """
+    status_code:int
+    headers:dict
+    content:bytes
+
+    def __init__(self, status_code:int, headers, content:bytes) -> None:
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8", errors="replace")
+
+    def json(self) -> json:
+        return json.loads(self.content)
+
+
+class AsyncRestfulApiHandler(RestfulApiHandler):
+    """
+    非阻塞版本的RestfulApiHandler (需要安裝aiohttp)\n
+    session：共用的aiohttp.ClientSession，未指定時會依config的連線池設定自行建立，多個handler共用同一個session即共用連線池
+    """
+    _session = None
+    _is_own_session:bool
+
+    def __init__(self, config:ConverterConfig, session = None, limiter = None, circuit_breaker = None) -> None:
+        if aiohttp == None:
+            raise ImportError("AsyncRestfulApiHandler requires 'aiohttp', please install it by 'pip install ai-voice-sdk[async]'.")
+
+        self._config = config
+        self._limiter = limiter
+        self._circuit_breaker = circuit_breaker
+        self._session = session
+        self._is_own_session = session == None
+
+
+    def _get_session(self):
+        # aiohttp.ClientSession需在event loop中建立，所以延後到第一次送出request時才建立
+        if self._session == None:
+            connector = aiohttp.TCPConnector(limit=self._config.get_pool_size(), force_close=not self._config.is_keep_alive())
+            self._session = aiohttp.ClientSession(connector=connector, trace_configs=[self._create_trace_config()])
+        return self._session
+
+
+    def _create_trace_config(self):
+        # 記錄建立連線的時間，只有送出request時帶入trace_request_ctx(啟用metrics_hook)才會記錄
+        async def on_connection_create_start(session, context, params):
+            context.connect_start_time = time.perf_counter()
+
+        async def on_connection_create_end(session, context, params):
+            if context.trace_request_ctx != None:
+                context.trace_request_ctx['connect_time'] = time.perf_counter() - context.connect_start_time
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_start.append(on_connection_create_start)
+        trace_config.on_connection_create_end.append(on_connection_create_end)
+        return trace_config
+
+
+    def _post(self, url:str, payload:map, operation:str, request_context:dict):
+        """
+        request_context：metrics_hook啟用時記錄request時間的dict，未啟用時為None
+        """
+        if request_context == None:
+            return self._get_session().post(url, headers=self._request_headers(), json=payload, timeout=self._client_timeout(operation))
+
+        request_context['start_time'] = time.perf_counter()
+        return self._get_session().post(url, headers=self._request_headers(), json=payload, timeout=self._client_timeout(operation),
+                                        trace_request_ctx=request_context)
+
+
+    def _new_request_context(self):
+        return {"connect_time": None} if Settings.metrics_hook.enabled else None
+
+
+    def _on_request(self, operation:str, request_context:dict, status_code:int, ttfb_time:float, size:int):
+        if request_context != None:
+            start_time = request_context['start_time']
+            Settings.metrics_hook.on_request(operation, status_code, request_context['connect_time'],
+                                             ttfb_time - start_time, time.perf_counter() - start_time, size)
+
+
+    async def close(self):
+        if self._is_own_session and (self._session != None):
+            await self._session.close()
+        self._session = None
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+
+    def _client_timeout(self, operation:str):
+        connect_timeout, read_timeout = self._config.get_timeout(operation)
+        return aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout)
+
+
+    async def _restful_sender(self, api_url:str, payload:map, operation = "submit", server_url = None) -> _AsyncResponse:
+        if self._limiter != None:
+            await self._limiter.acquire_async(self._config.get_token(), operation)
+
+        server_url = self._config.get_server() if server_url == None else server_url
+        url = f"{server_url}{api_url}"
+        request_context = self._new_request_context()
+        start_time = time.perf_counter()
+        try:
+            async with self._post(url, payload, operation, request_context) as result:
+                ttfb_time = time.perf_counter()
+                self._on_server_response(server_url, operation, result.status, ttfb_time - start_time)
+                content = await result.read()
+                self._on_request(operation, request_context, result.status, ttfb_time, len(content))
+                return _AsyncResponse(result.status, result.headers, content)
+        except Exception:
+            self._on_server_failure(server_url, operation)
+            raise
+
+
+    async def _allow_request_async(self, server_url:str, operation:str, is_wait = True) -> bool:
+        if self._circuit_breaker == None:
+            return True
+        if is_wait and self._circuit_breaker.is_wait():
+            await self._circuit_breaker.wait_async(server_url, operation)
+            return True
+        return self._circuit_breaker.allow(server_url, operation)
+
+
+    async def _send_task(self, api_url:str, payload:map) -> tuple:
+        tried_urls = []
+        while True:
+            server_url = self._select_server(tried_urls)
+            tried_urls.append(server_url)
+            is_last_server = self._is_last_server(tried_urls)
+            if not await self._allow_request_async(server_url, "submit", is_last_server):
+                if is_last_server:
+                    return (server_url, None)
+                continue
+            try:
+                return (server_url, await self._restful_sender(api_url, payload, server_url=server_url))
+            except aiohttp.ClientConnectorError:
+                if is_last_server:
+                    raise
+
+
+    async def add_text_task(self, text:str) -> json:
+        api_url = "/api/v1.0/syn/syn_text"
+        payload = self._text_task_payload(text)
+
+        if len(payload['text']) > 2000:
+            return {"data": "字數超過限制值", "code": 40010}
+
+        slot_id = None if self._limiter == None else await self._limiter.reserve_task_async(self._config.get_token())
+        result_json = None
+        try:
+            server_url, result = await self._send_task(api_url, payload)
+            result_json = self.circuit_open_result("submit") if result == None else self._response_handler(result)
+            self._pin_task(server_url, result_json)
+            return result_json
+        except Exception as error:
+            raise Exception(f"An unexpected error occurred: {error}")
+        finally:
+            self._bind_task_slot(slot_id, result_json)
+
+
+    async def add_ssml_task(self, ssml_text:str) -> json:
+        api_url = "/api/v1.0/syn/syn_ssml"
+        payload = self._ssml_task_payload(ssml_text)
+
+        if len(payload['ssml']) > 2000:
+            return {"data": "字數超過限制值", "code": 40010}
+
+        slot_id = None if self._limiter == None else await self._limiter.reserve_task_async(self._config.get_token())
+        result_json = None
+        try:
+            server_url, result = await self._send_task(api_url, payload)
+            result_json = self.circuit_open_result("submit") if result == None else self._response_handler(result)
+            self._pin_task(server_url, result_json)
+            return result_json
+        except Exception as error:
+            raise Exception(f"An unexpected error occurred: {error}")
+        finally:
+            self._bind_task_slot(slot_id, result_json)
+
+
+    async def get_task_status(self, task_id:str) -> json:
+        api_url = "/api/v1.0/syn/task_status"
+        payload = {
+            "task_id": task_id
+        }
+
+        server_url = self.get_task_server(task_id)
+        if not await self._allow_request_async(server_url, "status"):
+            return self.circuit_open_result("status")
+
+        try:
+            result = await self._restful_sender(api_url, payload, "status", server_url=server_url)
+            result_json = self._response_handler(result)
+        except Exception as error:
+            raise Exception(f"An unexpected error occurred: {error}")
+
+        self._release_task_slot(task_id, result_json)
+        self._finish_task(task_id, result_json)
+        return result_json
+
+
+    async def get_task_audio(self, task_id:str) -> json:
+        api_url = "/api/v1.0/syn/get_file"
+        payload = {
+            "filename": f"{task_id}.wav"
+        }
+
+        server_url = self.get_task_server(task_id)
+        if not await self._allow_request_async(server_url, "download"):
+            return self.circuit_open_result("download")
+
+        try:
+            start_time = time.perf_counter()
+            result = await self._restful_sender(api_url, payload, "download", server_url=server_url)
+            if result.headers['Content-Type'] == "audio/wav":
+                if Settings.metrics_hook.enabled:
+                    Settings.metrics_hook.on_download(len(result.content), time.perf_counter() - start_time)
+                self._release_task_slot(task_id)
+                self._finish_task(task_id)
+                return {"data": result.content, "code": 20001}
+            else:
+                return self._response_handler(result)
+        except Exception as error:
+            raise Exception(f"An unexpected error occurred: {error}")
+
+
+    async def download_task_audio(self, task_id:str, sink, block_size = Settings.read_block_size, expected_size = None, checksum = None) -> json:
+        """
+        非阻塞版本的RestfulApiHandler.download_task_audio，參數與回傳值相同(寫入sink為一般的同步呼叫)
+        """
+        api_url = "/api/v1.0/syn/get_file"
+        payload = {
+            "filename": f"{task_id}.wav"
+        }
+        server_url = self.get_task_server(task_id)
+        url = f"{server_url}{api_url}"
+        if not await self._allow_request_async(server_url, "download"):
+            return self.circuit_open_result("download")
+
+        try:
+            if self._limiter != None:
+                await self._limiter.acquire_async(self._config.get_token(), "download")
+
+            request_context = self._new_request_context()
+            start_time = time.perf_counter()
+            async with self._post(url, payload, "download", request_context) as result:
+                ttfb_time = time.perf_counter()
+                self._on_server_response(server_url, "download", result.status, ttfb_time - start_time)
+                if result.headers.get('Content-Type') != "audio/wav":
+                    content = await result.read()
+                    self._on_request("download", request_context, result.status, ttfb_time, len(content))
+                    return self._response_handler(_AsyncResponse(result.status, result.headers, content))
+
+                audio_sink = _AudioSink(sink, _get_expected_size(result.headers, expected_size), checksum)
+                try:
+                    async for block in result.content.iter_chunked(block_size):
+                        audio_sink.write(block)
+                except Exception:
+                    audio_sink.abort()
+                    raise
+
+                self._on_request("download", request_context, result.status, ttfb_time, audio_sink.size)
+                if request_context != None:
+                    Settings.metrics_hook.on_download(audio_sink.size, time.perf_counter() - request_context['start_time'])
+                self._release_task_slot(task_id)
+                self._finish_task(task_id)
+                return audio_sink.close()
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+            self._on_server_failure(server_url, "download")
+            raise Exception(f"An unexpected error occurred: {error}")
+        except Exception as error:
+            raise Exception(f"An unexpected error occurred: {error}")
+
+
 class Tools(object):
 
     def __init__(self) -> None:
         self._support_file_type = Settings.support_file_type
 
 
-    def save_wav_file(self, file_name:str, data:bytes):
+    def save_wav_file(self, file_name, data:bytes):
+        """
+        file_name：檔案名稱(不含副檔名)，或可寫入的binary stream
+        """
         try:
+            if hasattr(file_name, "write"):
+                file_name.write(data)
+                return
+
             with open(f"{file_name}.wav", 'wb') as write_index:
                 write_index.write(data)
                 write_index.close()
@@ -141,19 +805,25 @@ class Tools(object):
             raise IOError("Save wav file fail.")
 
 
-    def merge_wav_file(self, filename:str, audio_data_list:list):
+    def merge_wav_file(self, filename, audio_data_list:list):
+        """
+        filename：檔案名稱(不含副檔名)，或可寫入的binary stream\n
+        audio_data_list：wav音檔資料(bytes)\n
+        只解析每段音檔的header，PCM資料直接從原本的音檔寫入輸出檔，不解碼也不複製
+        """
+        try:
+            wav_list = [_parse_wav(audio_data) for audio_data in audio_data_list]
+        except Exception:
+            raise IOError("Merge wav file fail.")
+        params, pcm_list = _check_wav_params(wav_list)
+
         try:
-            merge_data = []
-            for audio_data in audio_data_list:
-                reader = wave.open(io.BytesIO(audio_data), 'rb')
-                merge_data.append([reader.getparams(), reader.readframes(reader.getnframes())])
-                reader.close()
+            if hasattr(filename, "write"):
+                _write_wav(filename, params, pcm_list)
+                return
 
-            writer = wave.open(f"{filename}.wav", 'wb')
-            writer.setparams(merge_data[0][0])
-            for data in merge_data:
-                writer.writeframes(data[1])
-            writer.close()
+            with open(f"{filename}.wav", 'wb') as write_index:
+                _write_wav(write_index, params, pcm_list)
         except Exception:
             raise IOError("Merge wav file fail.")
 
@@ -170,3 +840,19 @@ class Tools(object):
             raise Exception(f"An unexpected error occurred: {error}")
 
         return text
+
+
+    def iter_file_blocks(self, file_path:str, encode = "utf-8", block_size = Settings.read_block_size):
+        """
+        逐段讀取文字檔，每次回傳最多block_size個字
+        """
+        try:
+            f = open(file_path, 'r', encoding = encode)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"No such file or directory: {file_path}")
+
+        with f:
+            block = f.read(block_size)
+            while block:
+                yield block
+                block = f.read(block_size)
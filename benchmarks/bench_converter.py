@@ -0,0 +1,190 @@
+"""
+VoiceConverter與TextEditor效能測試，合成任務送到本機的mock_server，不需連線到正式服務
+
+python benchmarks/bench_converter.py [--sizes 2000 20000 100000] [--jobs 8] [--concurrency 4] [--repeat 5]
+                                     [--syn-time 0.2] [--busy-rate 0.0] [--fail-rate 0.0] [--ms-per-char 200]
+
+每個情境輸出 jobs/sec、每個job的p50/p99延遲、各API的request數量、client CPU時間與最大RSS
+TextEditor分段每個大小重複執行repeat次，輸出時間與CPU時間的中位數、最短時間與最大RSS
+"""
+import os
+import sys
+import time
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:
+    resource = None # Windows
+
+import requests
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, ".."))
+
+from ai_voice_sdk import VoiceConverter, ConverterConfig, ConverterStatus, Voice
+from ai_voice_sdk.textedit import TextEditor
+from bench_textedit import make_text, make_ssml
+
+
+def start_mock_server(args) -> tuple:
+    """
+    在另一個process啟動mock_server，client的CPU與記憶體統計不會包含伺服器\n
+    return：(process, server_url)
+    """
+    command = [sys.executable, os.path.join(BENCHMARK_DIR, "mock_server.py"), "--port", "0",
+               "--syn-time", str(args.syn_time), "--syn-time-per-char", str(args.syn_time_per_char),
+               "--latency", str(args.latency), "--busy-rate", str(args.busy_rate), "--fail-rate", str(args.fail_rate),
+               "--ms-per-char", str(args.ms_per_char)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    return (process, process.stdout.readline().strip())
+
+
+def get_server_stats(server_url:str) -> dict:
+    return requests.get(f"{server_url}/stats").json()
+
+
+def get_max_rss() -> int:
+    """
+    return：client目前為止的最大RSS(KB)，不支援時回傳0
+    """
+    if resource == None:
+        return 0
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss // 1024 if sys.platform == "darwin" else max_rss
+
+
+def percentile(values:list, ratio:float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(ratio * (len(values) - 1))))]
+
+
+def run_and_wait(config:ConverterConfig, text:str, max_workers:int) -> bool:
+    with VoiceConverter(config) as converter:
+        converter.text.add_text(text)
+        result = converter.run(interval_time=1, is_wait_speech=True, max_workers=max_workers)
+        return result.status == ConverterStatus.GetSpeechSuccess
+
+
+def run_then_get_speech(config:ConverterConfig, text:str, max_workers:int) -> bool:
+    with VoiceConverter(config) as converter:
+        converter.text.add_text(text)
+        result = converter.run(interval_time=1, max_workers=max_workers)
+        if result.status != ConverterStatus.ConverVoiceStart:
+            return False
+
+        while converter.check_status().status == ConverterStatus.ConverVoiceRunning:
+            time.sleep(0.1)
+        return converter.get_speech().status == ConverterStatus.GetSpeechSuccess
+
+
+def run_scenario(job, jobs:int, concurrency:int, server_url:str) -> dict:
+    """
+    以concurrency個執行緒執行jobs次job，job回傳是否成功
+    """
+    latencies = []
+
+    def timed_job(_):
+        start_time = time.perf_counter()
+        is_success = job()
+        latencies.append(time.perf_counter() - start_time)
+        return is_success
+
+    stats_before = get_server_stats(server_url)
+    cpu_before = time.process_time()
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        success_count = sum(executor.map(timed_job, range(jobs)))
+    wall_time = time.perf_counter() - start_time
+    cpu_time = time.process_time() - cpu_before
+    stats_after = get_server_stats(server_url)
+
+    return {
+        "jobs_per_sec": jobs / wall_time,
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+        "success": success_count,
+        "requests": {key: stats_after[key] - stats_before[key] for key in stats_after},
+        "cpu": cpu_time,
+        "max_rss": get_max_rss()
+    }
+
+
+def bench_converter(args, server_url:str):
+    config = ConverterConfig("benchmark-token", server_url)
+    config.set_voice(Voice.NOETIC)
+    scenarios = [
+        ("run(wait)", lambda text: run_and_wait(config, text, 1)),
+        (f"run(wait, max_workers={args.max_workers})", lambda text: run_and_wait(config, text, args.max_workers)),
+        ("run+get_speech", lambda text: run_then_get_speech(config, text, args.max_workers)),
+    ]
+
+    print(f"[converter] jobs={args.jobs} concurrency={args.concurrency} syn_time={args.syn_time}s "
+          f"busy_rate={args.busy_rate} fail_rate={args.fail_rate}")
+    print(f"{'scenario':<28} {'size':>8} {'jobs/s':>8} {'p50(s)':>8} {'p99(s)':>8} {'ok':>5} "
+          f"{'submit':>7} {'status':>7} {'file':>6} {'busy':>6} {'cpu(s)':>7} {'rss(MB)':>8}")
+    for size in args.sizes:
+        text = make_text(size)
+        for name, job in scenarios:
+            result = run_scenario(lambda: job(text), args.jobs, args.concurrency, server_url)
+            requests_count = result['requests']
+            print(f"{name:<28} {len(text):>8} {result['jobs_per_sec']:>8.2f} {result['p50']:>8.3f} {result['p99']:>8.3f} "
+                  f"{result['success']:>2}/{args.jobs:<2} "
+                  f"{requests_count['syn_text'] + requests_count['syn_ssml']:>7} {requests_count['task_status']:>7} "
+                  f"{requests_count['get_file']:>6} {requests_count['busy']:>6} {result['cpu']:>7.2f} {result['max_rss'] / 1024:>8.1f}")
+
+
+def bench_text_editor(args):
+    """
+    最大RSS為process目前為止的最大值，需在converter測試之前由小到大執行，才能反映分段所需的記憶體
+    """
+    print("[text_editor]")
+    print(f"{'function':<28} {'size':>8} {'paragraphs':>11} {'p50(s)':>8} {'min(s)':>8} {'cpu(s)':>7} {'rss(MB)':>8}")
+    for size in sorted(args.sizes):
+        text = make_text(size)
+        ssml = make_ssml(size)
+        for name, function, source in (("add_text", "add_text", text), ("add_ssml_text", "add_ssml_text", ssml)):
+            wall_times = []
+            cpu_times = []
+            for _ in range(args.repeat):
+                paragraphs = []
+                cpu_before = time.process_time()
+                start_time = time.perf_counter()
+                getattr(TextEditor(paragraphs), function)(source)
+                wall_times.append(time.perf_counter() - start_time)
+                cpu_times.append(time.process_time() - cpu_before)
+            print(f"{name:<28} {len(source):>8} {len(paragraphs):>11} {percentile(wall_times, 0.5):>8.4f} "
+                  f"{min(wall_times):>8.4f} {percentile(cpu_times, 0.5):>7.4f} {get_max_rss() / 1024:>8.1f}")
+    print()
+
+
+def main(argv:list):
+    parser = argparse.ArgumentParser(description="Benchmark VoiceConverter against a local mock synthesis server.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000, 100000], help="document sizes (characters)")
+    parser.add_argument("--jobs", type=int, default=8, help="jobs per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="jobs running at the same time")
+    parser.add_argument("--max-workers", type=int, default=4, help="VoiceConverter.run max_workers")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of each TextEditor function per size")
+    parser.add_argument("--syn-time", type=float, default=0.2)
+    parser.add_argument("--syn-time-per-char", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--busy-rate", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--ms-per-char", type=int, default=200, help="audio length of each character in the mock wav")
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    bench_text_editor(args)
+    process, server_url = start_mock_server(args)
+    try:
+        bench_converter(args, server_url)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,203 @@
+"""
+TextEditor分段效能測試
+
+python benchmarks/bench_textedit.py [size_mb ...]
+"""
+import os
+import re
+import sys
+import time
+import random
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from ai_voice_sdk.config import Settings
+from ai_voice_sdk.textedit import TextEditor
+
+
+def legacy_check_text_length(text:str) -> list:
+    """
+    舊版TextEditor.__check_text_length，每個分段都重新掃描保留字，並逐字向前尋找標點符號，
+    分段後再以多次replace跳脫保留字
+    """
+    def count_reserved_word(text:str) -> int:
+        count = 0
+        for key_word in [r'"', r'&', r"'", r'<', r'>']:
+            count += len(re.findall(key_word, text))
+        return count*6
+
+    limit = Settings.text_limit
+    result = []
+    text_length = len(text)
+    merge_start_position = 0
+    split_position = limit
+    punctuation = ['。', '！', '!', '？', '?', '\n', '\t', '，', ',', '、', '　', ' ', '（', '）', '(', ')', '「', '」', '；', '﹔']
+
+    while(split_position < text_length):
+        reserved_lenth = count_reserved_word(text[merge_start_position:split_position])
+        if reserved_lenth >= limit:
+            raise ValueError("Use too much reserved word.")
+
+        split_position -= reserved_lenth
+        for i in range(split_position-1, merge_start_position, -1):
+            if text[i] in punctuation:
+                split_position = i
+                break
+
+        result.append(text[merge_start_position:split_position])
+        merge_start_position = split_position
+        split_position += limit
+
+    result.append(text[merge_start_position:])
+
+    escaped_result = []
+    for paragraph in result:
+        for key_word, escaped_word in [('"', "&quot;"), ('&', "&amp;"), ("'", "&apos;"), ('<', "&lt;"), ('>', "&gt;")]:
+            if key_word in paragraph:
+                paragraph = paragraph.replace(key_word, escaped_word)
+        escaped_result.append(paragraph)
+    return escaped_result
+
+
+def legacy_format_ssml_text(editor:TextEditor, ssml:str) -> list:
+    """
+    舊版TextEditor.add_ssml_text的流程：以遞迴展開整個element tree，組合時每個tag的SSML文字產生兩次
+    """
+    def get_ssml_all_tags(element, layer = 1) -> list:
+        ssml_tags = [{"layer": layer, "tag": element.tag[element.tag.rfind('}')+1:], "attrib": element.attrib, \
+                      "text": element.text if element.text else ""}]
+        for child in element:
+            ssml_tags += get_ssml_all_tags(child, layer+1)
+            if child.tail:
+                ssml_tags.append({"layer": layer, "tag": "tail", "attrib": None, "text": child.tail})
+        return ssml_tags
+
+    limit = Settings.text_limit
+    tags = []
+    for tag in get_ssml_all_tags(ET.fromstring(ssml)):
+        for text in editor._TextEditor__check_text_length(tag['text']):
+            tags.append({"layer": tag['layer'], "tag": tag['tag'], "attrib": tag['attrib'], "text": text._text})
+
+    text_list = [""]
+    count = 0
+    length = 0
+    i = 0
+    is_prosody = False
+    prosody_layer = 1
+    prosody_tag_info = ""
+    for i in range(len(tags)-1):
+        ssml_text = editor._ssml_tag_to_text(tags[i])
+        if tags[i]['tag'] == "prosody":
+            is_prosody = True
+            prosody_layer = tags[i]['layer']
+            ssml_text = ssml_text[:ssml_text.rfind("</prosody")]
+            prosody_tag_info = ssml_text[:ssml_text.find(">")+1]
+
+        length += len(ssml_text)
+        text_list[count] += ssml_text
+
+        if is_prosody and (tags[i+1]['layer'] <= prosody_layer):
+            if not ((tags[i+1]['layer'] == prosody_layer) and (tags[i+1]['tag'] == "tail")):
+                is_prosody = False
+                prosody_tag_info = ""
+                length += len("</prosody>")
+                text_list[count] += "</prosody>"
+
+        if length + len(editor._ssml_tag_to_text(tags[i+1])) > limit:
+            text_list.append("")
+            count += 1
+            length = 0
+            if is_prosody:
+                text_list[count-1] += "</prosody>"
+                text_list[count] += prosody_tag_info
+
+    if len(tags) > 1:
+        i += 1
+    end_symbol = "</prosody>" if is_prosody else ""
+    last_text = editor._ssml_tag_to_text(tags[i])
+    if length + len(last_text) > limit:
+        text_list[count] += end_symbol
+        text_list.append(prosody_tag_info + last_text + end_symbol)
+    else:
+        text_list[count] = text_list[count] + last_text + end_symbol
+    return text_list
+
+
+def make_ssml(size:int, seed = 0) -> str:
+    """
+    產生約size個字的SSML測試文章，包含大量短的phoneme、break與prosody tag
+    """
+    rng = random.Random(seed)
+    words = "語音合成服務提供六個優質美聲大量語音合成歡迎企業用戶了解更多方案細節"
+    fragments = []
+    length = 0
+    while length < size:
+        sentence = "".join(rng.choice(words) for _ in range(rng.randint(5, 40))) + "，"
+        selector = rng.random()
+        if selector < 0.3:
+            fragment = f'<phoneme alphabet="bopomo" ph="ㄉㄜ˙" lang="TW">的</phoneme>{sentence}'
+        elif selector < 0.5:
+            fragment = f'<break time="{rng.randint(1, 20)*100}ms"/>{sentence}'
+        elif selector < 0.7:
+            fragment = f'<prosody volume="+1.0dB" rate="1.10" pitch="+1st">{sentence}</prosody>'
+        else:
+            fragment = sentence
+        fragments.append(fragment)
+        length += len(fragment)
+    return '<speak xmlns="http://www.w3.org/2001/10/synthesis" version="1.0.demo" xml:lang="zh-TW">' \
+           f'<voice name="Aurora_noetic">{"".join(fragments)}</voice></speak>'
+
+
+def make_text(size:int, seed = 0) -> str:
+    """
+    產生約size個字的測試文章，長句子較多，標點符號較稀疏
+    """
+    rng = random.Random(seed)
+    words = "語音合成服務提供六個優質美聲大量語音合成歡迎企業用戶了解更多方案細節"
+    sentences = []
+    length = 0
+    while length < size:
+        sentence = "".join(rng.choice(words) for _ in range(rng.randint(20, 600)))
+        if rng.random() < 0.05:
+            sentence += '"&"'
+        sentence += rng.choice("。，！？")
+        sentences.append(sentence)
+        length += len(sentence)
+    return "".join(sentences)
+
+
+def measure(function, text:str, repeat = 3) -> float:
+    best = None
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        function(text)
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best == None else min(best, elapsed)
+    return best
+
+
+def main(sizes:list):
+    editor = TextEditor([])
+    current = editor._TextEditor__check_text_length
+
+    print("[text] TextEditor.__check_text_length")
+    print(f"{'size':>10} {'legacy(s)':>10} {'current(s)':>11} {'speedup':>8}")
+    for size in sizes:
+        text = make_text(size)
+        legacy_time = measure(legacy_check_text_length, text)
+        current_time = measure(current, text)
+        print(f"{len(text):>10} {legacy_time:>10.4f} {current_time:>11.4f} {legacy_time/current_time:>7.1f}x")
+
+    print("\n[ssml] TextEditor.add_ssml_text")
+    print(f"{'size':>10} {'legacy(s)':>10} {'current(s)':>11} {'speedup':>8}")
+    for size in sizes:
+        ssml = make_ssml(size)
+        legacy_time = measure(lambda ssml: legacy_format_ssml_text(editor, ssml), ssml)
+        current_time = measure(lambda ssml: TextEditor([]).add_ssml_text(ssml), ssml)
+        print(f"{len(ssml):>10} {legacy_time:>10.4f} {current_time:>11.4f} {legacy_time/current_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    sizes = [int(float(arg) * 1024 * 1024) for arg in sys.argv[1:]] or [100_000, 1_000_000, 4_000_000]
+    main(sizes)
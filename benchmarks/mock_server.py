@@ -0,0 +1,225 @@
+"""
+本機模擬的語音合成伺服器，提供與API v1.0相同的syn_text、syn_ssml、task_status與get_file\n
+回傳的wav只由文字內容決定，可設定合成時間、回應延遲，以及忙碌(50301)與合成失敗的比例
+
+python benchmarks/mock_server.py [--port 8000] [--syn-time 0.2] [--busy-rate 0.1] ...
+
+GET /stats 取得各API的request數量，GET /reset 清除任務與統計
+"""
+import io
+import sys
+import json
+import time
+import wave
+import random
+import hashlib
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+
+class MockSynthesisServer(object):
+    """
+    syn_time：每個任務固定的合成時間(秒)\n
+    syn_time_per_char：每個字增加的合成時間(秒)\n
+    latency：每個request回應前的延遲(秒)\n
+    busy_rate：送出任務時回傳50301(合成器忙碌中)的比例\n
+    fail_rate：任務合成失敗(status = "ERROR")的比例\n
+    ms_per_char：wav中每個字的長度(毫秒)\n
+    seed：忙碌與失敗的亂數種子
+    """
+    url:str
+    stats:dict
+
+    def __init__(self, host = "127.0.0.1", port = 0, syn_time = 0.2, syn_time_per_char = 0.0, latency = 0.0,
+                 busy_rate = 0.0, fail_rate = 0.0, ms_per_char = 200, seed = 0) -> None:
+        self.syn_time = syn_time
+        self.syn_time_per_char = syn_time_per_char
+        self.latency = latency
+        self.busy_rate = busy_rate
+        self.fail_rate = fail_rate
+        self.ms_per_char = ms_per_char
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tasks = {} # {task_id: (done_time, is_fail, text)}
+        self._sequence = 0
+        self.stats = {}
+        self.reset()
+
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self.url = f"http://{host}:{self._server.server_address[1]}"
+        self._thread = None
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="mock-synthesis-server", daemon=True)
+        self._thread.start()
+        return self.url
+
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread != None:
+            self._thread.join()
+
+
+    def reset(self):
+        with self._lock:
+            self._tasks.clear()
+            self.stats = {"syn_text": 0, "syn_ssml": 0, "task_status": 0, "get_file": 0, "busy": 0, "error": 0}
+
+
+    def create_wav(self, text:str) -> bytes:
+        """
+        依文字內容產生固定的wav(16kHz, 16bit, mono)
+        """
+        digest = hashlib.sha256(text.encode("utf-8")).digest()
+        frame_count = max(1, len(text) * self.ms_per_char * 16)
+        pattern = digest * 32 # 1024 bytes = 512 frames
+        data = pattern * (frame_count * 2 // len(pattern)) + pattern[:frame_count * 2 % len(pattern)]
+
+        output = io.BytesIO()
+        with wave.open(output, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(16000)
+            writer.writeframes(data)
+        return output.getvalue()
+
+
+    def _add_task(self, api_name:str, text:str) -> tuple:
+        with self._lock:
+            self.stats[api_name] += 1
+            if self._random.random() < self.busy_rate:
+                self.stats['busy'] += 1
+                return (503, {"data": "synthesizer is busy", "code": 50301})
+
+            self._sequence += 1
+            task_id = hashlib.md5(f"{self._sequence}:{text}".encode("utf-8")).hexdigest()
+            is_fail = self._random.random() < self.fail_rate
+            done_time = time.monotonic() + self.syn_time + self.syn_time_per_char * len(text)
+            self._tasks[task_id] = (done_time, is_fail, text)
+            return (200, {"data": {"task_id": task_id}, "code": 20001})
+
+
+    def _get_task_status(self, task_id:str) -> tuple:
+        with self._lock:
+            self.stats['task_status'] += 1
+            task = self._tasks.get(task_id)
+        if task == None:
+            return (400, {"data": {"status": "NOT_EXISTS"}, "code": 50303})
+
+        done_time, is_fail, _ = task
+        if time.monotonic() < done_time:
+            return (200, {"data": {"status": "RUNNING"}, "code": 20001})
+        if is_fail:
+            with self._lock:
+                self.stats['error'] += 1
+            return (200, {"data": {"status": "ERROR"}, "code": 20001})
+        return (200, {"data": {"status": "SUCCESS"}, "code": 20001})
+
+
+    def _get_file(self, filename:str):
+        with self._lock:
+            self.stats['get_file'] += 1
+            task = self._tasks.get(filename[:-len(".wav")])
+        if (task == None) or (time.monotonic() < task[0]) or task[1]:
+            return (500, {"data": "file not found", "code": 50302})
+        return (200, self.create_wav(task[2]))
+
+
+    def _create_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status_code:int, body):
+                if server.latency > 0:
+                    time.sleep(server.latency)
+
+                if type(body) == bytes:
+                    content_type = "audio/wav"
+                else:
+                    content_type = "application/json"
+                    body = json.dumps(body).encode("utf-8")
+
+                self.send_response(status_code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path == "/stats":
+                    with server._lock:
+                        stats = dict(server.stats)
+                    self._send(200, stats)
+                elif self.path == "/reset":
+                    server.reset()
+                    self._send(200, {})
+                else:
+                    self._send(404, {"data": "Not Found", "code": 404})
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if not self.headers.get("Authorization", "").startswith("Bearer "):
+                    self._send(401, {"data": {"status": "Not authorized."}})
+                elif self.path == "/api/v1.0/syn/syn_text":
+                    self._send(*server._add_task("syn_text", payload.get("text", "")))
+                elif self.path == "/api/v1.0/syn/syn_ssml":
+                    self._send(*server._add_task("syn_ssml", payload.get("ssml", "")))
+                elif self.path == "/api/v1.0/syn/task_status":
+                    self._send(*server._get_task_status(payload.get("task_id", "")))
+                elif self.path == "/api/v1.0/syn/get_file":
+                    self._send(*server._get_file(payload.get("filename", "")))
+                else:
+                    self._send(404, {"data": "Not Found", "code": 404})
+
+        return Handler
+
+
+def main(argv:list):
+    parser = argparse.ArgumentParser(description="Local stand-in for the AI Voice synthesis API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--syn-time", type=float, default=0.2)
+    parser.add_argument("--syn-time-per-char", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--busy-rate", type=float, default=0.0)
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--ms-per-char", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = MockSynthesisServer(args.host, args.port, args.syn_time, args.syn_time_per_char, args.latency,
+                                 args.busy_rate, args.fail_rate, args.ms_per_char, args.seed)
+    # 第一行輸出伺服器網址，讓benchmark可以在port = 0時取得實際的port
+    print(server.url, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
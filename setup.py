@@ -22,4 +22,8 @@ setuptools.setup(
     install_requires=[
         'requests',
     ],
+    extras_require={
+        'async': ['aiohttp'],
+        'audio': ['numpy'],
+    },
 )
\ No newline at end of file